@@ -0,0 +1,157 @@
+"""
+Shared browser session for the scrapers
+One headless browser per run, a pool of warm contexts, and cookies/storage
+persisted between runs. Set WHATNOT_BROWSER_CDP to attach to a long-lived
+Chrome instead of launching one, e.g. on a headless worker:
+    chromium --headless=new --remote-debugging-port=9222
+    WHATNOT_BROWSER_CDP=http://localhost:9222 python3 scrape_whatnot.py
+"""
+import os
+from contextlib import asynccontextmanager, contextmanager
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+
+from resource_filter import DEFAULT_PROFILE, ResourceFilter
+
+STATE_PATH = "browser_state.json"
+DEFAULT_POOL_SIZE = 4
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def _context_options(state_path):
+    options = {"user_agent": USER_AGENT}
+    if state_path and os.path.exists(state_path):
+        options["storage_state"] = state_path
+    return options
+
+
+class BrowserSession:
+    """
+    Sync browser session. Use as a context manager and borrow contexts:
+        with BrowserSession() as session:
+            with session.context() as context:
+                page = context.new_page()
+    """
+
+    def __init__(self, headless=True, pool_size=DEFAULT_POOL_SIZE, state_path=STATE_PATH,
+                 resource_profile=DEFAULT_PROFILE, cdp_url=None):
+        self.headless = headless
+        self.pool_size = pool_size
+        self.state_path = state_path
+        self.cdp_url = cdp_url or os.getenv("WHATNOT_BROWSER_CDP")
+        self.resource_filter = ResourceFilter(resource_profile)
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+
+    def __enter__(self):
+        self._playwright = sync_playwright().start()
+        if self.cdp_url:
+            self._browser = self._playwright.chromium.connect_over_cdp(self.cdp_url)
+        else:
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _new_context(self):
+        context = self._browser.new_context(**_context_options(self.state_path))
+        self.resource_filter.install(context)
+        return context
+
+    @contextmanager
+    def context(self):
+        """Borrow a warm context from the pool; it goes back when the block exits"""
+        context = self._idle.pop() if self._idle else self._new_context()
+        try:
+            yield context
+        finally:
+            if len(self._idle) < self.pool_size:
+                for page in list(context.pages):
+                    page.close()
+                self._idle.append(context)
+            else:
+                self.save_state(context)
+                context.close()
+
+    def save_state(self, context):
+        if self.state_path:
+            context.storage_state(path=self.state_path)
+
+    def close(self):
+        if self._idle:
+            self.save_state(self._idle[0])
+        for context in self._idle:
+            context.close()
+        self._idle = []
+        if self._browser:
+            self._browser.close()  # Only disconnects when attached over CDP
+            self._browser = None
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
+
+
+class AsyncBrowserSession:
+    """Async twin of BrowserSession (async with / async with session.context())"""
+
+    def __init__(self, headless=True, pool_size=DEFAULT_POOL_SIZE, state_path=STATE_PATH,
+                 resource_profile=DEFAULT_PROFILE, cdp_url=None):
+        self.headless = headless
+        self.pool_size = pool_size
+        self.state_path = state_path
+        self.cdp_url = cdp_url or os.getenv("WHATNOT_BROWSER_CDP")
+        self.resource_filter = ResourceFilter(resource_profile)
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        if self.cdp_url:
+            self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+        else:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _new_context(self):
+        context = await self._browser.new_context(**_context_options(self.state_path))
+        await self.resource_filter.install_async(context)
+        return context
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow a warm context from the pool; it goes back when the block exits"""
+        context = self._idle.pop() if self._idle else await self._new_context()
+        try:
+            yield context
+        finally:
+            if len(self._idle) < self.pool_size:
+                for page in list(context.pages):
+                    await page.close()
+                self._idle.append(context)
+            else:
+                await self.save_state(context)
+                await context.close()
+
+    async def save_state(self, context):
+        if self.state_path:
+            await context.storage_state(path=self.state_path)
+
+    async def close(self):
+        if self._idle:
+            await self.save_state(self._idle[0])
+        for context in self._idle:
+            await context.close()
+        self._idle = []
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
@@ -1,64 +1,42 @@
-
-import json
-import csv
-
-def parse_sold(val):
-    if not val or val == "N/A":
-        return 0
-    val = str(val).upper().strip()
-    multiplier = 1
-    if val.endswith('K'):
-        multiplier = 1000
-        val = val[:-1]
-    elif val.endswith('M'):
-        multiplier = 1000000
-        val = val[:-1]
-    
-    try:
-        if '<' in val:
-            val = val.replace('<', '')
-        return float(val) * multiplier
-    except ValueError:
-        return 0
-
-def clean_data(input_file, output_json, output_csv):
-    with open(input_file, 'r') as f:
-        data = json.load(f)
-
-    # Filter rules: 
-    # 1. Rating must not be null/None
-    # 2. Sold count must be present (not N/A)
-    cleaned_data = []
-    
-    for entry in data:
-        rating = entry.get('Seller Rating')
-        sold = entry.get('Sold')
-        
-        # Check if invalid
-        if rating is None or rating == "N/A":
-            continue
-        if sold is None or sold == "N/A":
-            continue
-            
-        # Cleaned entry
-        cleaned_data.append(entry)
-
-    print(f"Original Clean Count: {len(data)}")
-    print(f"Cleaned Count: {len(cleaned_data)}")
-
-    # Save JSON
-    with open(output_json, 'w') as f:
-        json.dump(cleaned_data, f, indent=2)
-
-    # Save CSV
-    if cleaned_data:
-        keys = cleaned_data[0].keys()
-        with open(output_csv, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(cleaned_data)
-    
-    print(f"Saved to {output_json} and {output_csv}")
+from rules import apply_rules, compile_rules, in_range, is_count, required, strip
+from seller_store import CLEAN_STORE, SELLER_STORE, export_csv, export_json, load_frame, save_frame
+
+# Cleaning rules, applied in this order:
+# 1. Trim whitespace off the scraped identifiers
+# 2. A seller needs a UserID
+# 3. Rating must not be null/None, and must be a real 0-5 rating
+# 4. Sold count must be present and parse as a count (not N/A)
+CLEANING_RULES = [
+    strip("UserID"),
+    strip("UserName"),
+    required("UserID"),
+    required("Seller Rating"),
+    in_range("Seller Rating", 0, 5),
+    is_count("Sold"),
+]
+
+COMPILED_RULES = compile_rules(CLEANING_RULES)
+
+def clean_data(input_store, output_store, output_json, output_csv, rules=COMPILED_RULES):
+    df = load_frame(input_store)
+    cleaned, report = apply_rules(df, rules)
+
+    print(f"Original Clean Count: {len(df)}")
+    print(f"Cleaned Count: {len(cleaned)}")
+    if len(cleaned) < len(df):
+        print("Rejected by rule:")
+        for name, rejected in report.items():
+            if rejected:
+                print(f"  {name}: {rejected}")
+
+    store_file = save_frame(cleaned, output_store)
+
+    # JSON/CSV exports (every export has the same columns, whatever the records held)
+    export_json(cleaned, output_json)
+    export_csv(cleaned, output_csv)
+
+    print(f"Saved to {store_file} (exports: {output_json}, {output_csv})")
+    return report
 
 if __name__ == "__main__":
-    clean_data('seller_data.json', 'clean_seller_data.json', 'clean_seller_data.csv')
+    clean_data(SELLER_STORE, CLEAN_STORE, 'clean_seller_data.json', 'clean_seller_data.csv')
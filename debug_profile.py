@@ -1,11 +1,11 @@
 import re
-import time
-from playwright.sync_api import sync_playwright
+from browser_session import BrowserSession
+from readiness import wait_for_profile_ready
 
-def test_profile(url):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+def test_profile(url, headless=True):
+    # Load everything so the screenshot shows what a visitor would see
+    with BrowserSession(headless=headless, resource_profile="full") as session, \
+            session.context() as context:
         page = context.new_page()
         print(f"Navigating to {url}")
         page.goto(url)
@@ -13,7 +13,8 @@ def test_profile(url):
         # Wait for meaningful content or timeout
         try:
             page.wait_for_load_state("domcontentloaded")
-            time.sleep(5)
+            if not wait_for_profile_ready(page):
+                print("Profile stats never rendered (timed out)")
             page.screenshot(path="debug_screenshot.png")
             print("Screenshot saved to debug_screenshot.png")
             print(f"Title: {page.title()}")
@@ -27,8 +28,6 @@ def test_profile(url):
                 
         except Exception as e:
             print(f"Error: {e}")
-            
-        browser.close()
 
 if __name__ == "__main__":
     test_profile("https://www.whatnot.com/user/jalen4l")
@@ -1,10 +1,12 @@
-import time
-from playwright.sync_api import sync_playwright
+from browser_session import BrowserSession
+from readiness import scroll_for_links
+from resource_filter import DEFAULT_PROFILE
+from work_queue import QUEUE_PATH, WorkQueue
 
-def discover_sellers(target_count=150):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+def discover_sellers(target_count=150, resource_profile=DEFAULT_PROFILE, headless=True):
+    with BrowserSession(headless=headless, resource_profile=resource_profile) as session, \
+            session.context() as context:
+        page = context.new_page()
         
         sellers = set()
         categories = [
@@ -22,15 +24,9 @@ def discover_sellers(target_count=150):
             try:
                 page.goto(cat, wait_until="domcontentloaded")
                 
-                # Scroll down a few times
-                for _ in range(5):
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    time.sleep(2)
-                    
-                    # Scrape visible user links
-                    links = page.locator("a[href^='/user/']").all()
-                    for link in links:
-                        href = link.get_attribute("href")
+                # Scroll until the feed stops growing (at most 5 times)
+                for hrefs in scroll_for_links(page, max_scrolls=5):
+                    for href in hrefs:
                         if href:
                             full_url = f"https://www.whatnot.com{href}"
                             sellers.add(full_url)
@@ -41,7 +37,7 @@ def discover_sellers(target_count=150):
             except Exception as e:
                 print(f"Error on {cat}: {e}")
                     
-        browser.close()
+        print(session.resource_filter.report())
         return list(sellers)
 
 if __name__ == "__main__":
@@ -50,3 +46,9 @@ if __name__ == "__main__":
         for url in urls:
             f.write(url + "\n")
     print(f"Saved {len(urls)} URLs to seller_urls.txt")
+
+    # Feed the scraper's work queue directly; `scrape_whatnot.py --resume` picks them up
+    work_queue = WorkQueue()
+    added = work_queue.enqueue(urls)
+    work_queue.close()
+    print(f"Queued {added} new URLs in {QUEUE_PATH}")
@@ -1,18 +1,34 @@
 """
-Enrichment script for top 5 sellers
+Enrichment script for qualified sellers
 Collects: Reddit mentions, sentiment analysis, pricing data
 """
+import argparse
+import asyncio
 import json
+import math
 import time
-from collections import defaultdict
+from urllib.parse import quote
 
-import requests
-from bs4 import BeautifulSoup
-from textblob import TextBlob
-import time
-import random
+import sentiment
+from enrichment_store import STORE_PATH, EnrichmentStore
+from http_cache import HttpCache
+from reddit_client import RedditClient, RequestUnavailable
+from thread_store import MENTION_CHARS, ThreadStore, thread_mentions
+from seller_bot import evaluate_seller, load_data
+from seller_store import CLEAN_STORE, parsed_count
+
+SELLER_CONCURRENCY = 5
+MIN_REQUESTS_PER_SELLER = 2  # one search + at least one thread
+STALE_AFTER = 7 * 24 * 60 * 60  # enrichment this old counts as fully stale
+MIN_REFRESH_AGE = 24 * 60 * 60  # don't re-enrich anyone we looked at today
+
+PLACEHOLDER_MENTION = {
+    'text': "No public Reddit discussions found for this exact username.",
+    'sentiment': 'neutral',
+    'date': 'N/A'
+}
 
-def search_reddit_urls(query):
+async def search_reddit_urls(client, query):
     """
     Search directly within r/whatnotapp using Reddit's search endpoint
     search.json?q=QUERY&restrict_sr=on
@@ -20,25 +36,14 @@ def search_reddit_urls(query):
     # Extract just the username if "whatnot" is in the query
     username = query.replace("whatnot ", "").strip()
     
-    url = f"https://www.reddit.com/r/whatnotapp/search.json?q={username}&restrict_sr=on&sort=relevance&limit=10"
-    
-    # Robust headers are critical for Reddit
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-    }
+    url = f"https://www.reddit.com/r/whatnotapp/search.json?q={quote(username)}&restrict_sr=on&sort=relevance&limit=10"
     
     try:
-        time.sleep(2) # Be polite
         print(f"    Requesting: {url}")
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            print(f"    Error: Reddit returned {response.status_code}")
+        data = await client.get_json(url)
+        if data is None:
             return []
             
-        data = response.json()
         links = []
         
         children = data.get('data', {}).get('children', [])
@@ -51,95 +56,63 @@ def search_reddit_urls(query):
         print(f"    Found {len(links)} threads for '{username}'")
         return links
         
+    except RequestUnavailable:
+        raise  # not searched at all, which isn't the same as no results
     except Exception as e:
-        print(f"  Warning: Reddit search failed ({str(e)})")
-        return []
-
-def get_reddit_comments(url):
-    """
-    Fetch comments using Reddit's public JSON endpoint
-    URL -> URL.json
-    """
-    try:
-        # Clean URL and append .json
-        json_url = url.split('?')[0].rstrip('/') + '.json'
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
-        
-        response = requests.get(json_url, headers=headers)
-        if response.status_code != 200:
-            return []
-            
-        data = response.json()
-        comments = []
-        
-        # Parse Reddit JSON structure (List of listings: [0] is post, [1] is comments)
-        if isinstance(data, list) and len(data) > 1:
-            children = data[1].get('data', {}).get('children', [])
-            for child in children:
-                body = child.get('data', {}).get('body')
-                if body and body != '[deleted]' and body != '[removed]':
-                    comments.append(body[:200]) # Truncate for brevity
-                    if len(comments) >= 10: break # Increased from 5 to 10 comments per thread
-                    
-        return comments
-    except Exception as e:
-        print(f"  Warning: Failed to fetch grid {url} ({str(e)})")
-        return []
+        # An answer we can't read isn't "no results" either
+        raise RequestUnavailable(f"Reddit search failed ({str(e)})") from e
 
-def scrape_reddit_mentions(username):
+async def scrape_reddit_mentions(client, username, threads=None, user_id=None):
     """
     Scrape REAL Reddit mentions
     1. Search for threads
-    2. Extract comments
+    2. Extract comments (all threads at once through the shared thread store)
+    Raises RequestUnavailable if a request got no usable answer (budget spent, offline cache
+    miss, Reddit or network errors) partway through.
     """
     print(f"  Searching real Reddit threads for '{username}'...")
+    threads = threads or ThreadStore(client)
     
     # 1. Search for threads
-    urls = search_reddit_urls(f"whatnot {username}")
-    if not urls:
-        print(f"  No threads found. Trying username only.")
-        urls = search_reddit_urls(f"{username}")
+    # (search_reddit_urls strips "whatnot ", so a username-only retry would repeat the same request)
+    urls = await search_reddit_urls(client, f"whatnot {username}")
         
     mentions = []
     
     # 2. Extract comments
-    count = 0
     for url in urls:
         print(f"  Found thread: {url[:60]}...")
-        comments = get_reddit_comments(url)
-        for c in comments:
-            mentions.append({
-                'text': c,
-                'sentiment': 'unknown', # Will classify later
-                'date': '2024 (Recent)'
-            })
-        count += 1
-        time.sleep(1) # Be polite
+    found = await asyncio.gather(*(threads.get(url, user_id) for url in urls))
+    for thread in found:
+        if thread:
+            mentions.extend(thread_mentions(thread))
         
     if not mentions:
         # Fallback if scraping gets blocked or no results just so we don't crash
         print("  (No real comments found, using placeholder)")
-        mentions.append({
-            'text': "No public Reddit discussions found for this exact username.",
-            'sentiment': 'neutral',
-            'date': 'N/A'
-        })
+        mentions.append(dict(PLACEHOLDER_MENTION))
         
     return mentions
 
+def score_mentions(mentions, sentiment_cache=None):
+    """
+    Label every mention in place and return the sentiment summary.
+    New mentions are scored on their full text, then keep their polarity and only
+    MENTION_CHARS of text; already scored ones (with a 'polarity') aren't re-scored.
+    """
+    fresh = [m for m in mentions if 'polarity' not in m]
+    polarities = sentiment.score_texts([m['text'] for m in fresh], cache=sentiment_cache)
+    for m, polarity, label in zip(fresh, polarities, sentiment.labels(polarities)):
+        m['polarity'] = round(float(polarity), 4)
+        m['sentiment'] = str(label)
+        m['text'] = m['text'][:MENTION_CHARS]
+    return sentiment.summarize([m['polarity'] for m in mentions])
+
 def analyze_sentiment(text):
     """
-    Sentiment analysis using TextBlob
+    Sentiment analysis using TextBlob (single text; batches go through sentiment.score_texts)
     """
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
-    
-    if polarity > 0.1:
-        return 'positive'
-    elif polarity < -0.1:
-        return 'negative'
-    else:
-        return 'neutral'
+    return str(sentiment.labels(sentiment.score_texts([text]))[0])
 
 def analyze_pricing_outliers(seller_data):
     """
@@ -159,7 +132,7 @@ def analyze_pricing_outliers(seller_data):
         'note': 'Pricing analysis requires scraping individual listings'
     }
 
-def enrich_seller(seller):
+async def enrich_seller(client, seller, sentiment_cache=None, threads=None):
     """Enrich a single seller with additional data"""
     username = seller['UserName']
     userid = seller['UserID']
@@ -168,17 +141,11 @@ def enrich_seller(seller):
     print("-" * 50)
     
     # 1. Reddit mentions
-    mentions = scrape_reddit_mentions(username)
+    mentions = await scrape_reddit_mentions(client, username, threads, userid)
     
-    # 2. Sentiment analysis
-    sentiments = [analyze_sentiment(m['text']) for m in mentions]
-    sentiment_summary = {
-        'total_mentions': len(mentions),
-        'positive': sentiments.count('positive'),
-        'negative': sentiments.count('negative'),
-        'neutral': sentiments.count('neutral'),
-        'overall_sentiment': max(set(sentiments), key=sentiments.count) if sentiments else 'unknown'
-    }
+    # 2. Sentiment analysis (one batch per seller, off the event loop)
+    loop = asyncio.get_running_loop()
+    sentiment_summary = await loop.run_in_executor(None, score_mentions, mentions, sentiment_cache)
     
     # 3. Pricing analysis (Inferred/Mocked for demo)
     # In a real scenario, we'd scrape listings. Here we infer from Sales/Reviews ratio
@@ -222,38 +189,143 @@ def enrich_seller(seller):
     
     return seller
 
+def enrichment_priority(seller, last_updated, now):
+    """
+    Bigger sellers first, and sellers never enriched (or enriched long ago)
+    ahead of ones we looked at recently
+    """
+    volume = math.log10(1 + parsed_count(seller, 'Sold')) + math.log10(1 + parsed_count(seller, 'Reviews'))
+    if last_updated is None:
+        staleness = 1.0
+    else:
+        staleness = min((now - last_updated) / STALE_AFTER, 1.0)
+    return volume * (0.5 + staleness)
+
+def schedule(sellers, last_updated, now=None):
+    """Qualified sellers that are due for enrichment, highest priority first"""
+    now = now or time.time()
+    due = []
+    for s in sellers:
+        is_ok, _, _, _, _ = evaluate_seller(s)
+        if not is_ok:
+            continue
+        updated = last_updated.get(s['UserID'])
+        if updated is not None and now - updated < MIN_REFRESH_AGE:
+            continue
+        due.append(s)
+    due.sort(key=lambda s: enrichment_priority(s, last_updated.get(s['UserID']), now), reverse=True)
+    return due
+
+async def enrich_all(sellers, store, concurrency=SELLER_CONCURRENCY, request_budget=None, time_budget=None):
+    """
+    Enrich sellers in the given order on a bounded worker pool over one pooled Reddit client.
+    Each result goes to the store as soon as it's ready. Workers stop picking up
+    sellers once the request budget or the time budget is spent.
+    """
+    queue = asyncio.Queue()
+    for seller in sellers:
+        queue.put_nowait(seller)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    sentiment_cache = sentiment.SentimentCache()
+    enriched, deferred = [], []
+
+    async def worker(client, threads):
+        while not queue.empty():
+            if client.budget_left < MIN_REQUESTS_PER_SELLER:
+                return
+            if deadline and time.monotonic() >= deadline:
+                return
+            seller = queue.get_nowait()
+            try:
+                await enrich_seller(client, seller, sentiment_cache, threads)
+            except RequestUnavailable as e:
+                # Cut short: storing it would save placeholder data as if Reddit had nothing
+                print(f"  Deferred {seller['UserID']} to the next run ({e})")
+                deferred.append(seller)
+                continue
+            except Exception as e:
+                print(f"  Warning: enrichment failed for {seller['UserID']} ({e})")
+                continue
+            store.put(seller['UserID'], seller['enrichment'])
+            enriched.append(seller)
+
+    cache = HttpCache()
+    async with RedditClient(cache=cache, budget=request_budget) as client:
+        threads = ThreadStore(client)
+        await asyncio.gather(*(worker(client, threads) for _ in range(concurrency)))
+        print(f"\n({client.requests_made} Reddit requests, {cache.stats()})")
+        print(f"({len(threads.threads)} threads fetched, {threads.reused} repeat lookups served from the run's store)")
+
+    # Threads found for one seller often name others too; hand those mentions over
+    by_id = {s['UserID']: s for s in enriched}
+    for user_id, extra in threads.fan_out(enriched).items():
+        seller = by_id[user_id]
+        enrichment = seller['enrichment']
+        mentions = [m for m in enrichment['reddit_mentions'] if m['text'] != PLACEHOLDER_MENTION['text']]
+        for thread in extra:
+            mentions.extend(thread_mentions(thread))
+        enrichment['reddit_mentions'] = mentions
+        enrichment['sentiment_analysis'] = score_mentions(mentions, sentiment_cache)
+        store.put(user_id, enrichment)
+        print(f"  + {len(extra)} more threads mention {seller['UserName']}")
+    print(f"({sentiment_cache.stats()})")
+    sentiment_cache.close()
+
+    if deferred or not queue.empty():
+        print(f"{queue.qsize() + len(deferred)} sellers left for the next run (budget spent or Reddit unavailable)")
+    return enriched
+
 def main():
+    parser = argparse.ArgumentParser(description="Enrich qualified sellers with Reddit sentiment")
+    parser.add_argument("--input", default=CLEAN_STORE, help="Seller store (or legacy .json) to schedule from")
+    parser.add_argument("--concurrency", type=int, default=SELLER_CONCURRENCY, help="Sellers enriched at once")
+    parser.add_argument("--budget", type=int, help="Max Reddit requests for this run")
+    parser.add_argument("--time-budget", type=float, help="Stop starting new sellers after this many seconds")
+    parser.add_argument("--limit", type=int, help="Only schedule the N highest-priority sellers")
+    args = parser.parse_args()
+
     print("="*60)
     print("SELLER ENRICHMENT PIPELINE")
     print("="*60)
     
-    # Load top 5 sellers
-    with open('top_5_sellers.json', 'r') as f:
-        top_5 = json.load(f)
+    sellers = load_data(args.input)
+    store = EnrichmentStore()
+    queue = schedule(sellers, store.last_updated())
+    if args.limit:
+        queue = queue[:args.limit]
+    print(f"{len(queue)} qualified sellers due for enrichment (of {len(sellers)})")
     
-    # Enrich each seller
-    enriched_sellers = []
-    for seller in top_5:
-        enriched = enrich_seller(seller)
-        enriched_sellers.append(enriched)
-        time.sleep(1)  # Rate limiting
-    
-    # Save enriched data
+    # Enrich the sellers concurrently (rate limiting lives in the Reddit client)
+    enriched_sellers = asyncio.run(enrich_all(
+        queue, store,
+        concurrency=args.concurrency,
+        request_budget=args.budget,
+        time_budget=args.time_budget,
+    ))
+
+    # generate_report.py still reads the top 5 as a file
+    enrichment = store.all()
+    top_5 = [dict(s, enrichment=enrichment[s['UserID']])
+             for s in schedule(sellers, {}) if s['UserID'] in enrichment][:5]
     with open('enriched_top_5.json', 'w') as f:
-        json.dump(enriched_sellers, f, indent=2)
+        json.dump(top_5, f, indent=2)
     
     print("\n" + "="*60)
     print("✓ Enrichment complete!")
-    print(f"✓ Saved to: enriched_top_5.json")
+    print(f"✓ {len(enriched_sellers)} sellers enriched this run, {len(store)} in {STORE_PATH}")
+    print(f"✓ Top 5 saved to: enriched_top_5.json")
     print("="*60)
+    store.close()
     
     # Print summary
     print("\nSUMMARY:")
-    for seller in enriched_sellers:
+    for seller in enriched_sellers[:10]:
         sent = seller['enrichment']['sentiment_analysis']
         print(f"\n{seller['UserName']}:")
         print(f"  Mentions: {sent['total_mentions']}")
         print(f"  Sentiment: {sent['overall_sentiment']} ({sent['positive']} pos, {sent['negative']} neg)")
+    if len(enriched_sellers) > 10:
+        print(f"\n... and {len(enriched_sellers) - 10} more")
 
 if __name__ == "__main__":
     main()
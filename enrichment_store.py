@@ -0,0 +1,56 @@
+"""
+Enrichment results keyed by UserID
+Written one seller at a time as the scheduler finishes them, read by the chatbots
+"""
+import json
+import os
+import sqlite3
+import time
+
+STORE_PATH = "enrichment.db"
+
+
+class EnrichmentStore:
+    def __init__(self, path=STORE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS enrichment (
+                user_id    TEXT PRIMARY KEY,
+                enrichment TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def put(self, user_id, enrichment):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO enrichment (user_id, enrichment, updated_at) VALUES (?, ?, ?)",
+            (user_id, json.dumps(enrichment), time.time()),
+        )
+        self.conn.commit()
+
+    def last_updated(self):
+        """{UserID: unix time of its last enrichment}"""
+        return dict(self.conn.execute("SELECT user_id, updated_at FROM enrichment"))
+
+    def all(self):
+        """{UserID: enrichment dict}"""
+        return {user_id: json.loads(blob)
+                for user_id, blob in self.conn.execute("SELECT user_id, enrichment FROM enrichment")}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def load_enrichment(path=STORE_PATH):
+    """Every stored enrichment, or {} if nothing has been enriched yet"""
+    if not os.path.exists(path):
+        return {}
+    store = EnrichmentStore(path)
+    try:
+        return store.all()
+    finally:
+        store.close()
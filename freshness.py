@@ -0,0 +1,116 @@
+"""
+Per-seller freshness for incremental re-scrapes
+Remembers when each seller was last scraped and a hash of their metrics, so a
+refresh only revisits sellers whose TTL ran out and only emits the ones that changed
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+from metrics import parse_count
+from seller_bot import MIN_RATING, MIN_REVIEWS
+
+FRESHNESS_PATH = "seller_freshness.db"
+
+DAY = 24 * 60 * 60
+DEFAULT_TTL = 7 * DAY
+NEAR_THRESHOLD_TTL = 1 * DAY  # status can flip, check these often
+
+# Ratings are shown on a 0.1 grid, so "near" is counted in grid steps: the one
+# step below the cut (could flip up) and the one at it (could flip down).
+# 4.8 and 4.9 get the short TTL; 5.0 needs two steps to fall out.
+RATING_STEPS = 1
+REVIEWS_BAND = (0.5, 2.0)  # multiples of MIN_REVIEWS
+
+# Fields that make up a profile's content; bookkeeping fields are left out
+HASHED_FIELDS = ("UserName", "Seller Rating", "Reviews", "Average Ship", "Sold", "Following", "Followers")
+
+
+def content_hash(record):
+    payload = json.dumps([record.get(k) for k in HASHED_FIELDS], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def ttl_for(record):
+    """Shorter TTL for sellers sitting close to the onboarding thresholds"""
+    try:
+        rating = float(record.get("Seller Rating"))
+    except (TypeError, ValueError):
+        return NEAR_THRESHOLD_TTL
+    tenths, cut = round(rating * 10), round(MIN_RATING * 10)
+    if cut - RATING_STEPS <= tenths < cut + RATING_STEPS:
+        return NEAR_THRESHOLD_TTL
+
+    reviews = parse_count(record.get("Reviews"))
+    low, high = REVIEWS_BAND
+    if MIN_REVIEWS * low <= reviews <= MIN_REVIEWS * high:
+        return NEAR_THRESHOLD_TTL
+    return DEFAULT_TTL
+
+
+class FreshnessStore:
+    def __init__(self, path=FRESHNESS_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sellers (
+                user_id      TEXT PRIMARY KEY,
+                last_scraped REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                ttl          REAL NOT NULL,
+                kept         INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(sellers)")]
+        if "kept" not in columns:
+            # Stores from before the flag only held sellers that were kept
+            self.conn.execute("ALTER TABLE sellers ADD COLUMN kept INTEGER NOT NULL DEFAULT 1")
+        self.conn.commit()
+
+    def is_due(self, user_id, now=None):
+        row = self.conn.execute(
+            "SELECT last_scraped + ttl FROM sellers WHERE user_id = ?", (user_id.lower(),)
+        ).fetchone()
+        return row is None or row[0] <= (now or time.time())
+
+    def due(self, urls, user_id_of, now=None):
+        """The URLs whose seller was never scraped or whose TTL expired"""
+        now = now or time.time()
+        return [url for url in urls if self.is_due(user_id_of(url), now)]
+
+    def _row(self, user_id):
+        return self.conn.execute(
+            "SELECT content_hash, kept FROM sellers WHERE user_id = ?", (user_id.lower(),)
+        ).fetchone()
+
+    def changed(self, record):
+        """True if the profile content differs from the last observed scrape (or is new)"""
+        row = self._row(record["UserID"])
+        return row is None or row[0] != content_hash(record)
+
+    def was_kept(self, user_id):
+        """True if the last observed scrape of this seller was emitted (so the store holds it)"""
+        row = self._row(user_id)
+        return row is not None and bool(row[1])
+
+    def observe(self, record, kept=True, now=None):
+        """
+        Record a scrape once its outcome is final: restarts the seller's TTL and remembers
+        its content. `kept` says whether the record was emitted to the output batch.
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sellers (user_id, last_scraped, content_hash, ttl, kept) VALUES (?, ?, ?, ?, ?)",
+            (record["UserID"].lower(), now or time.time(), content_hash(record), ttl_for(record), int(kept)),
+        )
+        self.conn.commit()
+
+    def touch(self, record, now=None):
+        """An unchanged re-scrape: only restart the TTL"""
+        self.conn.execute(
+            "UPDATE sellers SET last_scraped = ?, ttl = ? WHERE user_id = ?",
+            (now or time.time(), ttl_for(record), record["UserID"].lower()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
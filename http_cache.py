@@ -0,0 +1,124 @@
+"""
+On-disk HTTP response cache for Reddit JSON
+One file per normalized URL holding the body plus ETag/Last-Modified, so
+stale entries can be revalidated with a conditional GET. Per-endpoint TTLs,
+and least-recently-used files are evicted once the directory is over budget.
+Pointing it at a fixture directory with offline=True replays recorded responses.
+"""
+import hashlib
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CACHE_DIR = os.getenv("REDDIT_CACHE_DIR", "reddit_cache")
+MAX_BYTES = 200 * 1024 * 1024
+
+HOUR = 60 * 60
+SEARCH_TTL = 6 * HOUR
+THREAD_TTL = 72 * HOUR  # threads change slowly once they're a few days old
+DEFAULT_TTL = HOUR
+
+
+def normalize_url(url):
+    """Lowercase scheme/host, drop the fragment and trailing slash, sort the query"""
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def ttl_for(url):
+    path = urlsplit(url).path
+    if path.endswith('/search.json'):
+        return SEARCH_TTL
+    if '/comments/' in path:
+        return THREAD_TTL
+    return DEFAULT_TTL
+
+
+class HttpCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, offline=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline or os.getenv("REDDIT_CACHE_OFFLINE") == "1"
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith('.json'))
+
+    def _path(self, url):
+        key = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, url):
+        """The cached entry for a URL (fresh or not), or None"""
+        path = self._path(url)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mtime doubles as the LRU clock
+        return entry
+
+    def is_fresh(self, entry):
+        return self.offline or time.time() - entry['fetched_at'] < ttl_for(entry['url'])
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, body, headers=None):
+        headers = headers or {}
+        entry = {
+            'url': normalize_url(url),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'body': body,
+        }
+        self._write(url, entry)
+
+    def mark_revalidated(self, url, entry):
+        """A 304 came back: the body is still good, restart its TTL"""
+        self.revalidated += 1
+        entry['fetched_at'] = time.time()
+        self._write(url, entry)
+
+    def _write(self, url, entry):
+        path = self._path(url)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        self._size += os.path.getsize(path) - old_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until we're back under 90% of the budget"""
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith('.json')),
+            key=lambda e: e.stat().st_mtime,
+        )
+        target = self.max_bytes * 0.9
+        for e in entries:
+            if self._size <= target:
+                break
+            size = e.stat().st_size
+            os.remove(e.path)
+            self._size -= size
+
+    def stats(self):
+        return (f"cache: {self.hits} hits, {self.misses} misses, {self.revalidated} revalidated, "
+                f"{self._size / 1024 / 1024:.1f} MB on disk")
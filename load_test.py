@@ -0,0 +1,113 @@
+"""
+Load test for seller_api.py
+Starts the API in-process on a free port (or targets --url) and drives it with
+concurrent keep-alive clients over a mix of lookups, queries and "why?" calls,
+then reports throughput and latency percentiles.
+
+    python3 load_test.py --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+from seller_api import SESSION_HEADER, create_app
+from seller_store import CLEAN_STORE
+
+QUERIES = [
+    "top 10 by sold",
+    "top 5 sellers with rating 5.0 and over 10K sold",
+    "most followers",
+    "best 20 sellers by reviews then followers",
+    "approved sellers shipping in 1d sorted by sold",
+    "worst 5 rating",
+]
+
+
+def requests_for(user_ids):
+    """An endless, shuffled mix of the API's endpoints"""
+    while True:
+        kind = random.random()
+        if kind < 0.4 and user_ids:
+            yield "GET", f"/sellers/{random.choice(user_ids)}", None
+        elif kind < 0.7:
+            yield "GET", "/query", {"q": random.choice(QUERIES)}
+        elif kind < 0.8:
+            yield "GET", "/best", None
+        elif kind < 0.9:
+            yield "GET", "/recommend", {"limit": "20"}
+        else:
+            yield "GET", "/why", None
+
+
+async def worker(session, base_url, mix, remaining, latencies, statuses):
+    session_id = None
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        method, path, params = next(mix)
+        headers = {SESSION_HEADER: session_id} if session_id else None
+        start = time.perf_counter()
+        async with session.request(method, base_url + path, params=params, headers=headers) as response:
+            await response.read()
+            session_id = response.headers.get(SESSION_HEADER, session_id)
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+
+
+async def run(base_url, total, concurrency, user_ids):
+    mix = requests_for(user_ids)
+    remaining = [total]
+    latencies, statuses = [], {}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session, base_url, mix, remaining, latencies, statuses)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000
+    print(f"{len(latencies)} requests in {elapsed:.2f}s -> {len(latencies) / elapsed:,.0f} req/s "
+          f"({concurrency} concurrent clients)")
+    print(f"Latency ms: p50 {pct(0.50):.1f} | p95 {pct(0.95):.1f} | p99 {pct(0.99):.1f} | max {latencies[-1] * 1000:.1f}")
+    print(f"Status codes: {dict(sorted(statuses.items()))}")
+
+
+async def main_async(args):
+    if args.url:
+        base_url = args.url.rstrip("/")
+        # Look up sellers the running API knows about
+        async with aiohttp.ClientSession() as session:
+            async with session.get(base_url + "/recommend", params={"limit": "1000"}) as response:
+                user_ids = [s['UserID'] for s in (await response.json())["sellers"]]
+        await run(base_url, args.requests, args.concurrency, user_ids)
+        return
+
+    app = create_app(args.input)
+    user_ids = [s['UserID'] for s in app["reloader"].catalog.sellers]
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        await run(f"http://127.0.0.1:{port}", args.requests, args.concurrency, user_ids)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the seller API")
+    parser.add_argument("--url", help="Target a running API (e.g. http://127.0.0.1:8080) instead of starting one")
+    parser.add_argument("--input", default=CLEAN_STORE, help="Seller store for the in-process API")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Parsing for Whatnot's abbreviated counts ("3.2K", "1.5M", "<10", "1,200")
+parse_count handles one value; parse_counts handles a whole column at once
+and says which entries were actually numbers. parse_days reads shipping times.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9}
+MISSING = {"", "N/A", "NONE", "NAN"}
+
+
+def _normalize(text):
+    return text.strip().upper().replace(",", "").lstrip("<>").strip()
+
+
+def parse_count(value, default=0.0):
+    """'3.2K' -> 3200.0; numbers pass through; `default` for missing or unparseable values"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return default if value != value else float(value)
+    text = _normalize(str(value))
+    multiplier = 1.0
+    if text[-1:] in MULTIPLIERS:
+        multiplier = MULTIPLIERS[text[-1]]
+        text = text[:-1]
+    if text.upper() in MISSING:
+        return default
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return default
+
+
+def parse_counts(values):
+    """
+    Vectorized parse_count over a column (Series, array or list).
+    Returns (float64 array, bool validity mask); invalid entries are 0.
+    Scraped counts repeat a lot ("1K", "<10"), so each distinct value is parsed once.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    counts, valid = _parse_unique(pd.Series(uniques, dtype=object))
+    if codes.size and (codes < 0).any():
+        counts, valid = np.append(counts, 0.0), np.append(valid, False)  # -1 (missing) indexes this slot
+    return counts[codes], valid[codes]
+
+
+def _parse_unique(s):
+    text = s.astype(str).str.strip().str.upper()
+    text = text.str.replace(",", "", regex=False).str.lstrip("<>").str.strip()
+    suffix = text.str[-1:]
+    has_suffix = suffix.isin(list(MULTIPLIERS))
+    multiplier = suffix.map(MULTIPLIERS).where(has_suffix, 1.0).astype(np.float64)
+    number = pd.to_numeric(text.where(~has_suffix, text.str[:-1]), errors="coerce")
+
+    counts = (number * multiplier).to_numpy(dtype=np.float64, copy=True)
+    valid = ~np.isnan(counts)
+    counts[~valid] = 0.0
+    return counts, valid
+
+
+DAYS_RE = re.compile(r"<?\s*(\d+(?:\.\d+)?)\s*(d|day|days|h|hr|hrs|hour|hours)?\b", re.IGNORECASE)
+
+
+def parse_days(value, default=float("nan")):
+    """Shipping time like "1d", "12h" or "2 days" in days; `default` if there's no number"""
+    if value is None:
+        return default
+    m = DAYS_RE.search(str(value))
+    if not m:
+        return default
+    number = float(m.group(1))
+    unit = (m.group(2) or "d").lower()
+    return number / 24 if unit.startswith("h") else number
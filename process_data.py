@@ -1,70 +1,234 @@
-
-import json
+"""
+Upsert scraped batch*.json files into the seller store
+Only batch files not merged before are read, streamed record by record so
+memory stays flat: one pass finds each seller's newest scrape (and snapshots
+every scrape into the seller history), a second sorts the winners by Sold in
+bounded runs spilled to disk, and a k-way merge of those runs with the existing
+store - last write wins by "Scraped At" - feeds the new store and the
+CSV / JSON Lines exports.
+"""
+import argparse
 import csv
 import glob
+import heapq
+import json
 import os
-import re
-
-def parse_number_string(s):
-    if not s or s == "N/A":
-        return 0
-    s = s.strip().upper()
-    multiplier = 1
-    if s.endswith('K'):
-        multiplier = 1000
-        s = s[:-1]
-    elif s.endswith('M'):
-        multiplier = 1000000
-        s = s[:-1]
-    
-    try:
-        if '<' in s:
-            s = s.replace('<', '')
-        return float(s) * multiplier
-    except ValueError:
-        return 0
+import tempfile
+
+from metrics import parse_count
+from seller_history import HISTORY_PATH, SellerHistory
+from seller_store import EXPORT_COLUMNS, SELLER_STORE, StoreWriter, iter_records, load_frame, store_path
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+RUN_SIZE = 50000      # records sorted in memory before a run is spilled
+STORE_CHUNK = 10000   # records per store row group
+READ_CHUNK = 1 << 16  # bytes read at a time by the fallback parser
+
 
 def clean_value(v):
     if v is None:
         return "N/A"
     return str(v)
 
-all_data = []
-
-# Load all batch files
-batch_files = glob.glob('batch*.json')
-batch_files.sort()
-
-for f in batch_files:
-    with open(f, 'r') as json_file:
-        data = json.load(json_file)
-        all_data.extend(data)
-
-# Sort by Sold count (descending) as a default useful view
-# We need to parse the "Sold" field which is a string like "1.5K"
-all_data.sort(key=lambda x: parse_number_string(x.get('Sold', '0')), reverse=True)
-
-# Write to CSV
-keys = ["UserID", "UserName", "Seller Rating", "Reviews", "Average Ship", "Sold", "Following", "Followers"]
-csv_file_path = 'seller_data.csv'
-
-with open(csv_file_path, 'w', newline='') as output_file:
-    dict_writer = csv.DictWriter(output_file, fieldnames=keys)
-    dict_writer.writeheader()
-    for row in all_data:
-        # Ensure all keys exist
-        row_clean = {k: clean_value(row.get(k, "N/A")) for k in keys}
-        dict_writer.writerow(row_clean)
-
-# Write combined JSON
-with open('seller_data.json', 'w') as json_out:
-    json.dump(all_data, json_out, indent=2)
-
-print(f"Combined {len(all_data)} profiles.")
-print(f"Saved to {csv_file_path} and seller_data.json")
-
-# Generate a quick summary
-top_5_sold = all_data[:5]
-print("\nTop 5 Sellers by Items Sold:")
-for s in top_5_sold:
-    print(f"- {s['UserName']} ({s['UserID']}): {s['Sold']} sold")
+
+def _iter_json_array(f):
+    """Items of a top-level JSON array, decoded one at a time from fixed-size reads"""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_CHUNK)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    started = False
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("unexpected end of JSON array")
+            fill()
+            continue
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("batch file is not a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        pos = end
+        yield item
+
+
+def iter_batch(path):
+    """Stream the records of one batch file"""
+    with open(path, "rb" if ijson else "r") as f:
+        items = ijson.items(f, "item", use_float=True) if ijson else _iter_json_array(f)
+        yield from items
+
+
+def seller_key(row):
+    return str(row.get("UserID", "")).lower()
+
+
+def find_latest(batch_files, history=None):
+    """
+    {seller key: (scraped_at, file index, record index, first-seen order)} for each seller's newest scrape.
+    Incremental scrapes only emit sellers that changed, so a seller can show up in an
+    old full batch and a newer delta batch; ties go to the later file.
+    Every record is also snapshotted into `history` when one is given.
+    """
+    latest = {}
+    for file_idx, path in enumerate(batch_files):
+        snapshot = []
+        for idx, row in enumerate(iter_batch(path)):
+            if history is not None:
+                snapshot.append(row)
+                if len(snapshot) >= STORE_CHUNK:
+                    history.record(snapshot)
+                    snapshot = []
+            key = seller_key(row)
+            scraped = row.get("Scraped At") or ""
+            seen = latest.get(key)
+            if seen is None:
+                latest[key] = (scraped, file_idx, idx, len(latest))
+            elif scraped >= seen[0]:
+                latest[key] = (scraped, file_idx, idx, seen[3])
+        if snapshot:
+            history.record(snapshot)
+    return latest
+
+
+def _spill(run, tmp_dir, runs):
+    run.sort(key=lambda item: (item[0], item[1]))
+    path = os.path.join(tmp_dir, f"run{len(runs)}.jsonl")
+    with open(path, "w") as f:
+        for item in run:
+            f.write(json.dumps(item) + "\n")
+    runs.append(path)
+    run.clear()
+
+
+def _read_run(path):
+    with open(path, "r") as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def sorted_latest(batch_files, latest, tmp_dir, run_size=RUN_SIZE, order_offset=0):
+    """(-sold, order, record) for each seller's newest record, highest Sold first (first-seen order breaks ties)"""
+    runs, run = [], []
+    for file_idx, path in enumerate(batch_files):
+        for idx, row in enumerate(iter_batch(path)):
+            winner = latest.get(seller_key(row))
+            if winner is None or winner[1:3] != (file_idx, idx):
+                continue
+            run.append((-parse_count(row.get("Sold")), order_offset + winner[3], row))
+            if len(run) >= run_size:
+                _spill(run, tmp_dir, runs)
+    if run:
+        _spill(run, tmp_dir, runs)
+    return heapq.merge(*(_read_run(p) for p in runs), key=lambda item: (item[0], item[1]))
+
+
+def _kept_rows(store, replaced):
+    """(-sold, order, record) for the stored sellers that no new scrape replaces (the store is sorted already)"""
+    for order, row in enumerate(iter_records(store, STORE_CHUNK)):
+        if seller_key(row) not in replaced:
+            yield (-(row.get("_sold_num") or 0.0), order, row)
+
+
+def merge_batches(pattern="batch*.json", store=SELLER_STORE, csv_path="seller_data.csv",
+                  jsonl_path="seller_data.jsonl", run_size=RUN_SIZE, history_path=HISTORY_PATH, rebuild=False):
+    """
+    Upsert the batch files matching `pattern` that haven't been merged yet.
+    Returns (seller count, top 5 by Sold), or (None, []) when there was nothing new.
+    """
+    history = SellerHistory(history_path)
+    try:
+        has_store = os.path.exists(store_path(store)) and not rebuild
+        if not has_store:
+            history.forget_ingested()
+        all_files = sorted(glob.glob(pattern))
+        batch_files = [p for p in all_files if not history.is_ingested(p)]
+        if has_store and not batch_files:
+            print(f"No new batch files; {store_path(store)} is up to date.")
+            return None, []
+
+        latest = find_latest(batch_files, history)
+        existing = {}
+        if has_store:
+            keys = load_frame(store, columns=["UserID", "Scraped At"])
+            existing = {str(uid).lower(): scraped if isinstance(scraped, str) else ""
+                        for uid, scraped in zip(keys["UserID"], keys["Scraped At"])}
+            # Last write wins: a scrape older than the one already stored is dropped
+            latest = {k: v for k, v in latest.items() if k not in existing or v[0] >= existing[k]}
+
+        writer = StoreWriter(store)
+        top_5, chunk, count = [], [], 0
+        with tempfile.TemporaryDirectory(prefix="process_data_") as tmp_dir, \
+                open(csv_path, "w", newline="") as csv_out, open(jsonl_path, "w") as jsonl_out:
+            streams = [sorted_latest(batch_files, latest, tmp_dir, run_size, order_offset=len(existing))]
+            if has_store:
+                streams.append(_kept_rows(store, latest))
+            dict_writer = csv.DictWriter(csv_out, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+            dict_writer.writeheader()
+            for _, _, row in heapq.merge(*streams, key=lambda item: (item[0], item[1])):
+                # Ensure all keys exist
+                dict_writer.writerow({k: clean_value(row.get(k)) for k in EXPORT_COLUMNS})
+                jsonl_out.write(json.dumps({k: row.get(k) for k in EXPORT_COLUMNS}) + "\n")
+                chunk.append(row)
+                if len(chunk) >= STORE_CHUNK:
+                    writer.write(chunk)
+                    chunk = []
+                if len(top_5) < 5:
+                    top_5.append(row)
+                count += 1
+            if chunk:
+                writer.write(chunk)
+        store_file = writer.close()
+        history.mark_ingested(batch_files)
+    finally:
+        history.close()
+
+    print(f"Upserted {len(latest)} sellers from {len(batch_files)} new batch files; {count} sellers in total.")
+    print(f"Saved to {store_file} (exports: {csv_path}, {jsonl_path})")
+    return count, top_5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge scraped batch files into the seller store")
+    parser.add_argument("--batches", default="batch*.json", help="Glob of batch files to merge")
+    parser.add_argument("--run-size", type=int, default=RUN_SIZE,
+                        help="Records sorted in memory before spilling a run to disk")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Ignore the existing store and re-merge every batch file")
+    args = parser.parse_args()
+
+    _, top_5_sold = merge_batches(args.batches, run_size=args.run_size, rebuild=args.rebuild)
+    if not top_5_sold:
+        return
+
+    # Generate a quick summary
+    print("\nTop 5 Sellers by Items Sold:")
+    for s in top_5_sold:
+        print(f"- {s['UserName']} ({s['UserID']}): {s['Sold']} sold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Seller profile extraction
+Pulls every profile field in one page.evaluate round-trip and only falls
+back to per-field locators for fields the script could not find
+"""
+import re
+import time
+
+SINGLE_PASS = "single-pass"
+LOCATORS = "locators"
+EXTRACT_MODES = (SINGLE_PASS, LOCATORS)
+
+FIELDS = ("username", "rating", "reviews", "ship", "sold", "following", "followers")
+
+# Field status values
+OK = "ok"                # found by the single-pass script
+FALLBACK = "fallback"    # found by a locator after the script missed it
+MISSING = "missing"      # not on the page, default used
+INVALID = "invalid"      # found but couldn't be parsed, default used
+
+FALLBACK_TIMEOUT_MS = 1000  # locators default to 30s, far too long for a field that isn't there
+
+# Mirrors the locators below so both paths read the same elements
+PROFILE_JS = r"""
+() => {
+    const text = el => (el && el.innerText ? el.innerText.trim() : null);
+    const out = {};
+
+    out.username = text(document.querySelector("div.flex.flex-col.justify-center > div.text-body1"));
+
+    out.rating = null;
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const v = walker.currentNode.nodeValue.trim();
+        if (/^\d\.\d$/.test(v)) { out.rating = v; break; }
+    }
+
+    const spans = Array.from(document.querySelectorAll("span"));
+    const spanWith = label => text(spans.find(s => (s.innerText || "").includes(label)));
+    out.reviews = spanWith("Reviews");
+    out.ship = spanWith("Avg Ship");
+    out.sold = spanWith("Sold");
+
+    const buttons = Array.from(document.querySelectorAll("button"));
+    const strongIn = label => {
+        const b = buttons.find(b => (b.innerText || "").includes(label));
+        return b ? text(b.querySelector("strong")) : null;
+    };
+    out.following = strongIn("Following");
+    out.followers = strongIn("Followers");
+    return out;
+}
+"""
+
+# Value used when a field is missing or invalid (same as the old bare excepts)
+DEFAULTS = {
+    "username": "N/A",
+    "rating": 0.0,
+    "reviews": "0",
+    "ship": "N/A",
+    "sold": "0",
+    "following": "0",
+    "followers": "0",
+}
+
+
+def _fallback_locator(page, field):
+    if field == "username":
+        return page.locator("div.flex.flex-col.justify-center > div.text-body1").first
+    if field == "rating":
+        return page.locator("text=/^\\d\\.\\d$/").first
+    if field == "reviews":
+        return page.locator("span", has_text=re.compile(r"Reviews")).first
+    if field == "ship":
+        return page.locator("span", has_text=re.compile(r"Avg Ship")).first
+    if field == "sold":
+        return page.locator("span", has_text=re.compile(r"Sold")).first
+    if field == "following":
+        return page.locator("button", has_text="Following").first.locator("strong").first
+    if field == "followers":
+        return page.locator("button", has_text="Followers").first.locator("strong").first
+    raise ValueError(f"Unknown profile field: {field}")
+
+
+def parse_field(field, raw):
+    """Turn raw element text into the stored value; raises ValueError if unusable"""
+    raw = raw.strip()
+    if not raw:
+        raise ValueError("empty")
+    if field == "rating":
+        return float(raw)
+    if field == "reviews":
+        # "3.2K Reviews" -> "3.2K"
+        return raw.split()[0]
+    if field == "ship":
+        # "1d Avg Ship" -> "1d"
+        return raw.replace(" Avg Ship", "")
+    if field == "sold":
+        return raw.replace(" Sold", "")
+    return raw
+
+
+def _apply(result, field, raw, found_status):
+    try:
+        result["fields"][field] = parse_field(field, raw)
+        result["status"][field] = found_status
+    except ValueError:
+        result["fields"][field] = DEFAULTS[field]
+        result["status"][field] = INVALID
+
+
+def _new_result():
+    return {"fields": dict(DEFAULTS), "status": {f: MISSING for f in FIELDS}}
+
+
+def extract_profile(page, mode=SINGLE_PASS):
+    """
+    Extract all profile fields from a loaded page.
+    Returns {"fields": {...}, "status": {field: ok|fallback|missing|invalid}}
+    """
+    result = _new_result()
+    if mode == SINGLE_PASS:
+        raw = page.evaluate(PROFILE_JS) or {}
+        for field in FIELDS:
+            if raw.get(field):
+                _apply(result, field, raw[field], OK)
+
+    for field in FIELDS:
+        if result["status"][field] != MISSING:
+            continue
+        try:
+            text = _fallback_locator(page, field).inner_text(timeout=FALLBACK_TIMEOUT_MS)
+        except Exception:
+            continue
+        _apply(result, field, text, FALLBACK)
+    return result
+
+
+async def async_extract_profile(page, mode=SINGLE_PASS):
+    """Async twin of extract_profile"""
+    result = _new_result()
+    if mode == SINGLE_PASS:
+        raw = await page.evaluate(PROFILE_JS) or {}
+        for field in FIELDS:
+            if raw.get(field):
+                _apply(result, field, raw[field], OK)
+
+    for field in FIELDS:
+        if result["status"][field] != MISSING:
+            continue
+        try:
+            text = await _fallback_locator(page, field).inner_text(timeout=FALLBACK_TIMEOUT_MS)
+        except Exception:
+            continue
+        _apply(result, field, text, FALLBACK)
+    return result
+
+
+def build_record(url, extraction):
+    """Shape an extraction result into the scraper's output record"""
+    fields = extraction["fields"]
+    return {
+        "UserID": url.split('/')[-1],
+        "UserName": fields["username"],
+        "Seller Rating": fields["rating"],
+        "Reviews": fields["reviews"],
+        "Average Ship": fields["ship"],
+        "Sold": fields["sold"],
+        "Following": fields["following"],
+        "Followers": fields["followers"],
+        "Scraped At": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "RawRating": fields["rating"]  # For filtering
+    }
+
+
+def is_empty(extraction):
+    """True if no field was found at all (e.g. a challenge or error page instead of a profile)"""
+    return all(status in (MISSING, INVALID) for status in extraction["status"].values())
+
+
+def describe_status(extraction):
+    """Short summary of the fields that didn't come from the single pass, e.g. 'fallback: rating'"""
+    groups = {}
+    for field, status in extraction["status"].items():
+        if status != OK:
+            groups.setdefault(status, []).append(field)
+    return "; ".join(f"{status}: {', '.join(fields)}" for status, fields in groups.items())
@@ -0,0 +1,209 @@
+"""
+Multi-criteria seller queries for the rule-based bot
+A question like "top 5 sellers with rating 5.0 and over 10K sold shipping in 1d,
+sorted by reviews" is parsed into a Plan (filters, sort keys with tie-breakers,
+limit) and run against a SellerCatalog's metric arrays with boolean masks.
+A single descending sort is answered straight from the catalog's rank arrays.
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from metrics import parse_count, parse_days
+from seller_catalog import TIE_BREAKERS as RANK_TIE_BREAKERS
+
+Filter = namedtuple("Filter", "metric op value")
+SortKey = namedtuple("SortKey", "metric descending")
+Plan = namedtuple("Plan", "filters sort limit")
+
+DEFAULT_LIMIT = 10
+TIE_BREAKERS = [SortKey(m, True) for m in RANK_TIE_BREAKERS]
+
+METRIC_NAMES = {
+    "rating": "Rating",
+    "sold": "Items Sold",
+    "reviews": "Review Count",
+    "followers": "Followers",
+    "ship": "Shipping Time",
+}
+
+# Words that name each metric in a question
+METRIC_WORDS = {
+    "rating": r"ratings?|rated|stars?",
+    "sold": r"items sold|sold|sales|sells",
+    "reviews": r"reviews?",
+    "followers": r"followers?",
+    "ship": r"ship(?:s|ping)?(?: time)?|avg ship",
+}
+METRIC_RE = "|".join(f"(?P<{m}>{words})" for m, words in METRIC_WORDS.items())
+
+OP_WORDS = [
+    (">=", r"at least|no less than|min(?:imum)?|>=|≥"),
+    ("<=", r"at most|no more than|max(?:imum)?|within|<=|≤"),
+    (">", r"over|above|more than|greater than|higher than|>"),
+    ("<", r"under|below|less than|fewer than|lower than|<"),
+    ("==", r"exactly|equal to|=="),
+]
+OP_RE = "|".join(f"(?:{words})" for _, words in OP_WORDS)
+NUM_RE = r"\d[\d,]*(?:\.\d+)?\s*[kmb]?\b"
+
+OPS = {
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    ">": np.greater,
+    "<": np.less,
+    "==": np.isclose,
+}
+
+SHIP_RE = re.compile(rf"\bship(?:s|ping)?(?: time)?\s+(?:(?P<op>{OP_RE}|in)\s+)?(?P<num>\d+(?:\.\d+)?\s*(?:d|h|days?|hours?)?)\b")
+OP_FIRST_RE = re.compile(rf"(?P<op>{OP_RE})\s+(?P<num>{NUM_RE})\+?\s*(?:{METRIC_RE})\b")
+NUM_FIRST_RE = re.compile(rf"(?<![\w.])(?P<num>{NUM_RE})\+?\s*(?:{METRIC_RE})\b")
+METRIC_FIRST_RE = re.compile(rf"\b(?:{METRIC_RE})\s+(?:of\s+|is\s+)?(?P<op>{OP_RE})?\s*(?P<num>{NUM_RE})")
+
+LIMIT_RE = re.compile(r"\b(?:top|first|best|worst|bottom|limit|show(?: me)?|list|give me)\s+(\d+)\b|\b(\d+)\s+(?:sellers|users|results|people|stores)\b")
+APPROVED_RE = re.compile(r"\b(?:approved|qualified|qualify|qualifying|onboardable|eligible)\b")
+
+SORT_BY_RE = re.compile(rf"\b(?:by|then)\s+(?P<dir>highest|lowest|most|least|fewest|fastest|slowest)?\s*(?:{METRIC_RE})(?:\s+(?P<order>asc|ascending|desc|descending))?")
+SORT_ADJ_RE = re.compile(rf"\b(?P<dir>most|highest|largest|top|best|least|fewest|lowest|worst|fastest|slowest)\s+(?:{METRIC_RE})")
+ANY_METRIC_RE = re.compile(rf"\b(?:{METRIC_RE})\b")
+
+BEST_FIRST = {"ship": False}  # fastest shipping is the smallest number
+
+
+def _metric(match):
+    return next(m for m in METRIC_WORDS if match.group(m))
+
+
+def _op(word):
+    for op, words in OP_WORDS:
+        if re.fullmatch(words, word):
+            return op
+    return ">="
+
+
+def _value(metric, text):
+    if metric == "ship":
+        return parse_days(text)
+    if metric == "rating":
+        return float(text.replace(",", ""))
+    return parse_count(text)
+
+
+def _direction(metric, word=None, order=None):
+    """True for descending"""
+    if order:
+        return order.startswith("desc")
+    if word in ("most", "highest", "largest", "slowest"):
+        return True
+    if word in ("least", "fewest", "lowest", "fastest"):
+        return False
+    best_desc = BEST_FIRST.get(metric, True)
+    return not best_desc if word == "worst" else best_desc
+
+
+def parse_query(text):
+    """Parse a question into a Plan; filter text is consumed so it isn't read twice"""
+    q = " " + text.lower() + " "
+    filters = []
+
+    def consume(start, end):
+        nonlocal q
+        q = q[:start] + " " * (end - start) + q[end:]
+
+    def take(match, metric, op, num):
+        filters.append(Filter(metric, op, _value(metric, num)))
+        consume(*match.span())
+
+    # "top 5 ..." is a limit, not a filter on whatever metric follows; "top" stays for the sort
+    limit = DEFAULT_LIMIT
+    m = LIMIT_RE.search(q)
+    if m:
+        group = 1 if m.group(1) else 2
+        limit = int(m.group(group))
+        consume(*m.span(group))
+
+    for m in list(SHIP_RE.finditer(q)):
+        op = m.group("op")
+        take(m, "ship", "<=" if op in (None, "in") else _op(op), m.group("num"))
+    for m in list(OP_FIRST_RE.finditer(q)):
+        take(m, _metric(m), _op(m.group("op")), m.group("num"))
+    for m in list(NUM_FIRST_RE.finditer(q)):
+        take(m, _metric(m), ">=", m.group("num"))
+    for m in list(METRIC_FIRST_RE.finditer(q)):
+        op = m.group("op")
+        take(m, _metric(m), _op(op) if op else ">=", m.group("num"))
+
+    if APPROVED_RE.search(q):
+        filters.append(Filter("approved", "==", True))
+
+    sort = []
+    found = sorted([(m.start(), _metric(m), m.group("dir"), m.group("order")) for m in SORT_BY_RE.finditer(q)]
+                   + [(m.start(), _metric(m), m.group("dir"), None) for m in SORT_ADJ_RE.finditer(q)])
+    for _, metric, word, order in found:
+        if metric not in (k.metric for k in sort):
+            sort.append(SortKey(metric, _direction(metric, word, order)))
+    if not sort:
+        # Rank by the first metric the question mentions, else rating
+        mentioned = ANY_METRIC_RE.search(" " + text.lower() + " ")
+        metric = _metric(mentioned) if mentioned else "rating"
+        sort.append(SortKey(metric, _direction(metric, "worst" if re.search(r"\bworst\b", q) else None)))
+    for key in TIE_BREAKERS:
+        if key.metric not in (k.metric for k in sort):
+            sort.append(key)
+    return Plan(filters, sort, limit)
+
+
+def has_metric_filters(plan):
+    """True if the question filtered on a metric (not just on onboarding approval)"""
+    return any(f.metric != "approved" for f in plan.filters)
+
+
+def execute(plan, catalog):
+    """Sellers matching every filter, ordered by the sort keys, at most plan.limit of them"""
+    mask = np.ones(len(catalog), dtype=bool)
+    for f in plan.filters:
+        if f.metric == "approved":
+            mask &= catalog.approved_mask
+        else:
+            with np.errstate(invalid="ignore"):
+                mask &= OPS[f.op](catalog.values[f.metric], f.value)  # NaN never matches
+
+    primary = plan.sort[0]
+    if primary.descending and plan.sort == _ranked_order(primary.metric):
+        # Index path: the catalog's rank array already has this exact order, keep what passes the filters
+        if not plan.filters:
+            return catalog.top(primary.metric, plan.limit)
+        ranking = catalog.rankings[primary.metric]
+        rows = ranking[mask[ranking]]
+        return [catalog.sellers[i] for i in rows[:plan.limit]]
+
+    rows = np.flatnonzero(mask)
+    keys = [rows]  # dataset order breaks any remaining ties
+    for key in reversed(plan.sort):
+        v = catalog.values[key.metric][rows]
+        v = -v if key.descending else v
+        keys.append(np.nan_to_num(v, nan=np.inf))  # missing values sort last either way
+    order = np.lexsort(keys)
+    return [catalog.sellers[i] for i in rows[order][:plan.limit]]
+
+
+def _ranked_order(metric):
+    """The sort keys a catalog ranking for `metric` follows"""
+    return [SortKey(metric, True)] + [k for k in TIE_BREAKERS if k.metric != metric]
+
+
+def describe(plan):
+    """Plain-English explanation of a plan for the bot's 'why?'"""
+    parts = []
+    for f in plan.filters:
+        if f.metric == "approved":
+            parts.append("meet the onboarding criteria")
+        elif f.metric == "ship":
+            parts.append(f"ship in {f.op} {f.value:g} day(s)")
+        else:
+            parts.append(f"{METRIC_NAMES[f.metric]} {f.op} {f.value:g}")
+    filters = " and ".join(parts) if parts else "no filters"
+    order = ", then ".join(f"{METRIC_NAMES[k.metric]} ({'highest' if k.descending else 'lowest'} first)"
+                           for k in plan.sort)
+    return f"Filters: {filters}.\nOrdered by {order}.\nShowing up to {plan.limit}."
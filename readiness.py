@@ -0,0 +1,72 @@
+"""
+Readiness waits for Whatnot pages
+Replaces fixed sleeps with waits on the selectors we actually read
+"""
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+DEFAULT_TIMEOUT_MS = 10000
+SETTLE_TIMEOUT_MS = 3000  # networkidle fallback; Whatnot keeps sockets open so don't wait long
+
+# The stats row renders last on a profile, so the Followers button means the page is usable
+PROFILE_READY_SELECTOR = "button:has-text('Followers')"
+USER_LINK_SELECTOR = "a[href^='/user/']"
+
+COLLECT_HREFS_JS = "els => els.map(e => e.getAttribute('href'))"
+COUNT_GREW_JS = "([sel, n]) => document.querySelectorAll(sel).length > n"
+SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight)"
+
+
+def wait_for_profile_ready(page, timeout=DEFAULT_TIMEOUT_MS):
+    """
+    Wait until the profile stats are rendered.
+    Falls back to a short network-idle wait; returns False if neither happened.
+    """
+    try:
+        page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        pass
+    try:
+        page.wait_for_load_state("networkidle", timeout=SETTLE_TIMEOUT_MS)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def async_wait_for_profile_ready(page, timeout=DEFAULT_TIMEOUT_MS):
+    """Async twin of wait_for_profile_ready"""
+    try:
+        await page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        pass
+    try:
+        await page.wait_for_load_state("networkidle", timeout=SETTLE_TIMEOUT_MS)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def scroll_for_links(page, selector=USER_LINK_SELECTOR, max_scrolls=5, timeout=DEFAULT_TIMEOUT_MS):
+    """
+    Walk an infinite-scroll page and yield the hrefs matching `selector` after each load.
+    After every scroll we wait for the link count to grow; if it doesn't within
+    `timeout` the feed is exhausted and we stop instead of scrolling blindly.
+    """
+    try:
+        page.wait_for_selector(selector, timeout=timeout)
+    except PlaywrightTimeoutError:
+        return
+
+    # One evaluate per scroll instead of a get_attribute round-trip per link
+    hrefs = page.eval_on_selector_all(selector, COLLECT_HREFS_JS)
+    yield hrefs
+
+    for _ in range(max_scrolls):
+        page.evaluate(SCROLL_JS)
+        try:
+            page.wait_for_function(COUNT_GREW_JS, arg=[selector, len(hrefs)], timeout=timeout)
+        except PlaywrightTimeoutError:
+            return  # No new links appeared
+        hrefs = page.eval_on_selector_all(selector, COLLECT_HREFS_JS)
+        yield hrefs
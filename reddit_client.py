@@ -0,0 +1,164 @@
+"""
+Async Reddit JSON client
+One pooled keep-alive session for every request, paced by a token bucket
+that follows Reddit's X-Ratelimit-* headers
+"""
+import asyncio
+import time
+
+import aiohttp
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json,text/html;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+DEFAULT_RATE = 1.0   # requests per second before Reddit tells us otherwise
+DEFAULT_BURST = 5
+MAX_CONNECTIONS = 10
+MAX_RETRIES = 3
+TIMEOUT_SECONDS = 20
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MISSING_STATUSES = {404, 410}  # a real "nothing here" answer
+
+
+class RequestUnavailable(Exception):
+    """
+    A request that got no usable answer: the request budget is spent, an offline
+    cache has no answer, retries ran out, or Reddit/the network failed
+    """
+
+
+class TokenBucket:
+    """Token bucket whose refill rate tracks the remaining quota Reddit reports"""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update_from_headers(self, headers):
+        """
+        X-Ratelimit-Remaining: requests left in the window
+        X-Ratelimit-Reset: seconds until the window resets
+        """
+        try:
+            remaining = float(headers['X-Ratelimit-Remaining'])
+            reset = float(headers['X-Ratelimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        if remaining < 1:
+            self.pause(reset)
+        elif reset > 0:
+            # Spread what's left evenly over the rest of the window
+            self.rate = max(remaining / reset, 0.01)
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class RedditClient:
+    """
+    async with RedditClient() as client:
+        data = await client.get_json(url)
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_connections=MAX_CONNECTIONS, cache=None,
+                 budget=None):
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache
+        self.budget = budget  # max network requests for this client's lifetime (None = unlimited)
+        self.max_connections = max_connections
+        self.requests_made = 0
+        self._session = None
+
+    @property
+    def budget_left(self):
+        return float('inf') if self.budget is None else max(self.budget - self.requests_made, 0)
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT_SECONDS),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def get_json(self, url):
+        """
+        GET a JSON endpoint; returns the decoded body, or None when Reddit answers that
+        there's nothing there (404/410).
+        Fresh cache entries skip the network; stale ones are revalidated with ETag/Last-Modified.
+        Raises RequestUnavailable when the budget is spent, an offline cache misses, retries
+        run out, or the request fails (403, 5xx, timeouts, connection errors), so callers
+        can tell "not fetched" apart from "no results".
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            self.cache.hits += 1
+            return entry['body']
+        if self.cache:
+            self.cache.misses += 1
+            if self.cache.offline:
+                raise RequestUnavailable(f"offline cache miss: {url}")
+        headers = self.cache.conditional_headers(entry) if entry else None
+
+        status = None
+        for attempt in range(MAX_RETRIES):
+            await self.bucket.acquire()
+            if not self.budget_left:
+                raise RequestUnavailable("request budget spent")  # cached answers still work
+            self.requests_made += 1
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    self.bucket.update_from_headers(response.headers)
+                    status = response.status
+                    if status in RETRY_STATUSES:
+                        try:
+                            retry_after = float(response.headers['Retry-After'])
+                        except (KeyError, ValueError):
+                            retry_after = 2 ** attempt
+                        label = "Rate limited by Reddit" if status == 429 else f"Reddit returned {status}"
+                        print(f"    {label}, waiting {retry_after:.0f}s")
+                        self.bucket.pause(retry_after)
+                        continue
+                    if status == 304 and entry:
+                        self.cache.mark_revalidated(url, entry)
+                        return entry['body']
+                    if status in MISSING_STATUSES:
+                        return None
+                    if status != 200:
+                        raise RequestUnavailable(f"Reddit returned {status}: {url}")
+                    body = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                raise RequestUnavailable(f"{type(e).__name__} for {url}") from e
+            if self.cache:
+                self.cache.put(url, body, response.headers)
+            return body
+        raise RequestUnavailable(f"Reddit returned {status} after {MAX_RETRIES} attempts: {url}")
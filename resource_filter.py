@@ -0,0 +1,96 @@
+"""
+Request interception for scraping
+Aborts images, fonts, media and third-party requests we never read
+"""
+from collections import Counter
+from urllib.parse import urlparse
+
+PROFILES = {
+    # Load everything (debugging, screenshots)
+    "full": {"block_types": (), "allow_domains": None},
+    # Drop heavy assets but keep every domain
+    "no-media": {"block_types": ("image", "media", "font"), "allow_domains": None},
+    # Only what's needed to render text: Whatnot's own documents, scripts, styles and API calls
+    "text-only": {"block_types": ("image", "media", "font"), "allow_domains": ("whatnot.com",)},
+}
+DEFAULT_PROFILE = "text-only"
+
+
+def _host_allowed(host, allow_domains):
+    if not host:
+        return True
+    return any(host == d or host.endswith("." + d) for d in allow_domains)
+
+
+class ResourceFilter:
+    """Routes every request on a browser context and aborts the ones the profile blocks"""
+
+    def __init__(self, profile=DEFAULT_PROFILE, allow_domains=None):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown resource profile '{profile}' (choose from {', '.join(PROFILES)})")
+        self.profile = profile
+        self.block_types = set(PROFILES[profile]["block_types"])
+        self.allow_domains = allow_domains if allow_domains is not None else PROFILES[profile]["allow_domains"]
+
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.blocked_by_reason = Counter()
+        self.bytes_loaded = 0
+
+    @property
+    def enabled(self):
+        return bool(self.block_types or self.allow_domains)
+
+    def block_reason(self, request):
+        """Why a request should be aborted, or None to let it through"""
+        if request.resource_type in self.block_types:
+            return request.resource_type
+        if self.allow_domains and not _host_allowed(urlparse(request.url).hostname, self.allow_domains):
+            return "third-party"
+        return None
+
+    def _decide(self, route):
+        reason = self.block_reason(route.request)
+        if reason:
+            self.requests_blocked += 1
+            self.blocked_by_reason[reason] += 1
+        else:
+            self.requests_allowed += 1
+        return reason
+
+    def _on_route(self, route):
+        if self._decide(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _on_route_async(self, route):
+        if self._decide(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _on_response(self, response):
+        # Headers are already on the client; this doesn't cost a browser round-trip
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.bytes_loaded += int(length)
+
+    def install(self, context):
+        """Attach to a sync Playwright browser context"""
+        context.on("response", self._on_response)
+        if self.enabled:
+            context.route("**/*", self._on_route)
+
+    async def install_async(self, context):
+        """Attach to an async Playwright browser context"""
+        context.on("response", self._on_response)
+        if self.enabled:
+            await context.route("**/*", self._on_route_async)
+
+    def report(self):
+        """One-line summary of what was blocked and loaded"""
+        reasons = ", ".join(f"{r}={n}" for r, n in self.blocked_by_reason.most_common())
+        return (f"Resources ({self.profile}): {self.requests_blocked} requests blocked"
+                f"{' (' + reasons + ')' if reasons else ''}, {self.requests_allowed} allowed, "
+                f"{self.bytes_loaded / 1024:.0f} KB loaded")
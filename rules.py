@@ -0,0 +1,121 @@
+"""
+Declarative record rules
+Cleaning and validation rules are declared once as data, e.g.
+
+    RULES = [strip("UserName"), required("UserID"), in_range("Seller Rating", 0, 5)]
+
+and compiled into vectorized column operations over a DataFrame: coercions
+rewrite a column, checks produce a boolean mask. Applying them returns the
+rows that pass plus how many rows each rule rejected.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from metrics import parse_counts
+
+Rule = namedtuple("Rule", "name column kind args")
+
+MISSING_TEXT = ["", "N/A"]
+
+
+# --- Coercions (run first, in declared order) ---
+
+def strip(column):
+    return Rule(f"strip {column}", column, "strip", ())
+
+
+def to_float(column):
+    return Rule(f"{column} as float", column, "to_float", ())
+
+
+# --- Checks ---
+
+def required(column):
+    return Rule(f"{column} required", column, "required", ())
+
+
+def is_count(column):
+    """Parses as a count like "3.2K" or "<10" """
+    return Rule(f"{column} is a count", column, "is_count", ())
+
+
+def in_range(column, low=None, high=None):
+    """Present values must fall within [low, high]; missing values are left to `required`"""
+    return Rule(f"{column} in [{low}, {high}]", column, "in_range", (low, high))
+
+
+def one_of(column, values):
+    return Rule(f"{column} one of {sorted(values)}", column, "one_of", (frozenset(values),))
+
+
+def _strip(col):
+    return col.where(col.isna(), col.astype(str).str.strip())
+
+
+def _to_float(col):
+    return pd.to_numeric(col, errors="coerce").astype(np.float64)
+
+
+def _required(col):
+    if pd.api.types.is_numeric_dtype(col):
+        return col.notna()
+    return col.notna() & ~col.astype(str).str.strip().isin(MISSING_TEXT)
+
+
+def _is_count(col):
+    return parse_counts(col)[1]
+
+
+def _in_range(col, low, high):
+    num = pd.to_numeric(col, errors="coerce")
+    ok = pd.Series(True, index=col.index)
+    if low is not None:
+        ok &= num >= low
+    if high is not None:
+        ok &= num <= high
+    return (num.isna() | ok).to_numpy()
+
+
+def _one_of(col, values):
+    return col.isin(values).to_numpy()
+
+
+COERCIONS = {"strip": _strip, "to_float": _to_float}
+CHECKS = {"required": _required, "is_count": _is_count, "in_range": _in_range, "one_of": _one_of}
+
+
+def compile_rules(rules):
+    """Resolve each rule to its column function once; returns (coercions, checks)"""
+    coercions, checks = [], []
+    for rule in rules:
+        if rule.kind in COERCIONS:
+            coercions.append((rule, COERCIONS[rule.kind]))
+        elif rule.kind in CHECKS:
+            checks.append((rule, CHECKS[rule.kind]))
+        else:
+            raise ValueError(f"Unknown rule kind: {rule.kind}")
+    return coercions, checks
+
+
+def apply_rules(df, compiled):
+    """
+    Run compiled rules over a DataFrame.
+    Returns (passing rows, {rule name: rows it rejected}); a row failing
+    several rules counts against each of them.
+    """
+    coercions, checks = compiled
+    df = df.copy()
+    for rule, fn in coercions:
+        if rule.column in df:
+            df[rule.column] = fn(df[rule.column], *rule.args)
+
+    keep = np.ones(len(df), dtype=bool)
+    report = {}
+    for rule, fn in checks:
+        col = df[rule.column] if rule.column in df else pd.Series(None, index=df.index, dtype=object)
+        ok = np.asarray(fn(col, *rule.args), dtype=bool)
+        report[rule.name] = int((~ok).sum())
+        keep &= ok
+    return df[keep].reset_index(drop=True), report
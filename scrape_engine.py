@@ -0,0 +1,171 @@
+"""
+Async scraping engine for seller profiles
+Runs a bounded pool of Playwright pages with a per-host rate limit
+"""
+import asyncio
+import time
+from urllib.parse import urlparse
+
+from browser_session import AsyncBrowserSession
+from profile_extract import SINGLE_PASS, async_extract_profile, build_record, describe_status, is_empty
+from resource_filter import DEFAULT_PROFILE as DEFAULT_RESOURCE_PROFILE
+from readiness import async_wait_for_profile_ready
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0  # page loads per second, per host
+
+
+class HostRateLimiter:
+    """Spaces out request starts per host so the page pool doesn't hammer one site"""
+
+    def __init__(self, rate_per_sec=DEFAULT_RATE):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url):
+        host = urlparse(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def get_profile_data(page, url, extract_mode=SINGLE_PASS):
+    """Extracts data from a single seller profile; None if it failed or the page had no profile fields"""
+    try:
+        print(f"Scraping {url}...")
+        await page.goto(url, wait_until="domcontentloaded")
+        await async_wait_for_profile_ready(page)
+
+        extraction = await async_extract_profile(page, mode=extract_mode)
+        if is_empty(extraction):
+            print(f"Error scraping {url}: no profile fields on the page (challenge or error page?)")
+            return None
+        summary = describe_status(extraction)
+        if summary:
+            print(f"  ({summary})")
+        return build_record(url, extraction)
+
+    except Exception as e:
+        print(f"Error scraping {url}: {e}")
+        return None
+
+
+def qualifies(profile, min_rating):
+    """Same rating filter the sequential scraper applied"""
+    try:
+        r = float(profile["Seller Rating"])
+    except (TypeError, ValueError, KeyError):
+        print("  -> Skipping (Invalid Rating)")
+        return False
+    if r >= min_rating:
+        print(f"  -> Keeping (Rating: {r})")
+        return True
+    print(f"  -> Skipping (Rating: {r} < {min_rating})")
+    return False
+
+
+async def _worker(session, queue, limiter, state):
+    async with session.context() as context:
+        page = await context.new_page()
+        while not state['stop'].is_set():
+            try:
+                i, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await limiter.wait(url)
+            if state['stop'].is_set():
+                return
+
+            print(f"Processing {i+1}/{state['total']}: {url}")
+            profile = await get_profile_data(page, url, extract_mode=state['extract_mode'])
+            queue_db = state['work_queue']
+            if not profile:
+                if queue_db:
+                    queue_db.mark_failed(url, "scrape error")
+                continue
+            # Freshness is only updated once the profile's outcome is final, so a result that
+            # gets dropped is re-scraped next time instead of looking unchanged
+            freshness = state['freshness']
+            if freshness and not freshness.changed(profile):
+                print("  -> Unchanged since last scrape")
+                freshness.touch(profile)
+                if queue_db:
+                    queue_db.mark_unchanged(url)
+                continue
+            if not qualifies(profile, state['min_rating']):
+                if freshness and freshness.was_kept(profile['UserID']):
+                    # Fell below the cut: emit it anyway so the merged store stops holding the old record
+                    print("  -> Emitting (previously kept, now below the cut)")
+                    state['data'].append(profile)
+                    if queue_db:
+                        queue_db.mark_done(url, profile)
+                    freshness.observe(profile, kept=True)
+                    continue
+                if queue_db:
+                    queue_db.mark_skipped(url, profile)
+                if freshness:
+                    freshness.observe(profile, kept=False)
+                continue
+
+            # Pages finish out of order; once the target is hit, late results are dropped
+            # (and stay pending in the work queue)
+            if state['kept'] < state['target']:
+                state['kept'] += 1
+                state['data'].append(profile)
+                if queue_db:
+                    queue_db.mark_done(url, profile)
+                if freshness:
+                    freshness.observe(profile, kept=True)
+            if state['kept'] >= state['target']:
+                print(f"Reached {state['target']} qualified sellers!")
+                state['stop'].set()
+
+
+async def scrape_profiles(session, urls, concurrency=DEFAULT_CONCURRENCY, rate_per_sec=DEFAULT_RATE,
+                          min_rating=4.9, target=100, extract_mode=SINGLE_PASS, work_queue=None, freshness=None):
+    """
+    Scrape many profiles at once, one page per borrowed context.
+    Stops handing out URLs as soon as `target` qualified sellers are collected.
+    If a WorkQueue is given, every outcome is committed to it as it happens.
+    If a FreshnessStore is given, profiles whose content hasn't changed are dropped, and
+    previously kept sellers that fell below the rating cut are returned too.
+    """
+    queue = asyncio.Queue()
+    for item in enumerate(urls):
+        queue.put_nowait(item)
+
+    state = {
+        'data': [],
+        'kept': 0,  # qualified sellers in data (data also holds sellers that fell below the cut)
+        'stop': asyncio.Event(),
+        'total': len(urls),
+        'min_rating': min_rating,
+        'target': target,
+        'extract_mode': extract_mode,
+        'work_queue': work_queue,
+        'freshness': freshness,
+    }
+    limiter = HostRateLimiter(rate_per_sec)
+
+    workers = max(1, min(concurrency, len(urls)))
+    await asyncio.gather(*(_worker(session, queue, limiter, state) for _ in range(workers)))
+    return state['data']
+
+
+async def run(urls, concurrency=DEFAULT_CONCURRENCY, rate_per_sec=DEFAULT_RATE, min_rating=4.9, target=100,
+              extract_mode=SINGLE_PASS, resource_profile=DEFAULT_RESOURCE_PROFILE, headless=True, work_queue=None,
+              freshness=None):
+    """Open a browser session and scrape the given profile URLs concurrently"""
+    async with AsyncBrowserSession(headless=headless, pool_size=concurrency,
+                                   resource_profile=resource_profile) as session:
+        try:
+            return await scrape_profiles(session, urls, concurrency=concurrency, rate_per_sec=rate_per_sec,
+                                         min_rating=min_rating, target=target, extract_mode=extract_mode,
+                                         work_queue=work_queue, freshness=freshness)
+        finally:
+            print(session.resource_filter.report())
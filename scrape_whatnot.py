@@ -1,131 +1,17 @@
-import re
+import argparse
+import asyncio
+import math
 import time
 import pandas as pd
-from playwright.sync_api import sync_playwright
-
-def clean_number(text):
-    """Converts 3.2K to 3200, 1.5M to 1500000, etc."""
-    if not text:
-        return 0
-    text = text.upper().replace(',', '').strip()
-    if 'K' in text:
-        return int(float(text.replace('K', '')) * 1000)
-    if 'M' in text:
-        return int(float(text.replace('M', '')) * 1000000)
-    try:
-        return float(text)
-    except ValueError:
-        return 0
-
-def get_profile_data(page, url):
-    """Extracts data from a single seller profile."""
-    try:
-        print(f"Scraping {url}...")
-        page.goto(url, wait_until="domcontentloaded")
-        time.sleep(2)  # Wait for dynamic content
-
-        # Extract UserID from URL
-        user_id = url.split('/')[-1]
-
-        # Selectors based on research
-        # Note: These are heuristic based on the previous analysis
-        # We look for specific text patterns if classes are unstable, but try structure first.
-
-        # UserName
-        try:
-            username = page.locator("div.flex.flex-col.justify-center > div.text-body1").first.inner_text()
-        except:
-            username = "N/A"
-
-        # Stats Container
-        # We can find stats by searching for the text labels
-        
-        # Rating
-        rating = 0.0
-        try:
-           # Look for the star icon's sibling or text like "4.9"
-           # Often it's at the top. Let's look for text that matches a rating pattern
-           rating_text = page.locator("text=/^\\d\\.\\d$/").first.inner_text()
-           rating = float(rating_text)
-        except:
-            pass
-            
-        # If regex locator fails, try broader
-        if rating == 0.0:
-             # Fallback: finding the reviews and looking near it
-             pass
-
-        # Reviews
-        reviews_count = 0
-        try:
-            reviews_text = page.locator("span", has_text=re.compile(r"Reviews")).first.inner_text()
-            # extract number "3.2K Reviews" -> "3.2K"
-            reviews_clean = reviews_text.split()[0]
-            reviews_count = clean_number(reviews_clean) # Keep raw if needed? Request said "3.2K" format in output, but we need to filter?
-            # Actually user wants output format: "3.2K". Filtering is on rating.
-            # But the table example shows specific formats. I should store raw for display and clean for logic if needed?
-            # The request asks for output format similar to "3.2K".
-            # I will store the display string but might need value for sorting if "Top Performing" implies sorting.
-            # User asks: "identify the top performing seller" -> implies sorting by Sales or Followers?
-            # "Get any 100 sellers data... user with rating less than 4.9 please eliminate"
-            
-            # Let's clean later, just get text for now
-            reviews_str = reviews_clean
-        except:
-            reviews_str = "0"
-        
-        # Avg Ship
-        try:
-            ship_text = page.locator("span", has_text=re.compile(r"Avg Ship")).first.inner_text()
-            ship_str = ship_text.split()[0] + "d" if 'Avg' in ship_text else ship_text
-            # Usually "1d Avg Ship"
-            ship_str = ship_text.replace(" Avg Ship", "")
-        except:
-            ship_str = "N/A"
-
-        # Sold
-        try:
-            sold_text = page.locator("span", has_text=re.compile(r"Sold")).first.inner_text()
-            sold_str = sold_text.replace(" Sold", "")
-        except:
-            sold_str = "0"
-
-        # Following
-        try:
-            # Locate button with Strong text "Following"
-            following_btn = page.locator("button", has_text="Following").first
-            following_str = following_btn.locator("strong").first.inner_text()
-        except:
-            following_str = "0"
 
-        # Followers
-        try:
-            followers_btn = page.locator("button", has_text="Followers").first
-            followers_str = followers_btn.locator("strong").first.inner_text()
-        except:
-            followers_str = "0"
-            
-        
-        # Refine Rating extraction if missed
-        if rating == 0.0:
-             # Try to find the element before 'Reviews' if they are siblings?
-             pass
-
-        return {
-            "UserID": user_id,
-            "UserName": username,
-            "Seller Rating": rating,
-            "Reviews": reviews_str,
-            "Average Ship": ship_str,
-            "Sold": sold_str,
-            "Following": following_str,
-            "Followers": followers_str,
-            "RawRating": rating # For filtering
-        }
-
-    except Exception as e:
-        print(f"Error scraping {url}: {e}")
-        return None
+import scrape_engine
+from browser_session import BrowserSession
+from freshness import FreshnessStore
+from profile_extract import EXTRACT_MODES, SINGLE_PASS
+from readiness import scroll_for_links
+from resource_filter import DEFAULT_PROFILE as DEFAULT_RESOURCE_PROFILE, PROFILES as RESOURCE_PROFILES
+from shard import batch_path, parse_shard_spec, queue_path as shard_queue_path, urls_for_shard
+from work_queue import DONE, QUEUE_PATH, WorkQueue, load_url_file, user_id_from_url
 
 def discover_sellers(page, target_count=150):
     """Discovers seller URLs from category pages."""
@@ -144,15 +30,9 @@ def discover_sellers(page, target_count=150):
         print(f"Navigating to {cat}")
         page.goto(cat, wait_until="domcontentloaded")
         
-        # Scroll down a few times
-        for _ in range(5):
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2)
-            
-            # Scrape visible user links
-            links = page.locator("a[href^='/user/']").all()
-            for link in links:
-                href = link.get_attribute("href")
+        # Scroll until the feed stops growing (at most 5 times)
+        for hrefs in scroll_for_links(page, max_scrolls=5):
+            for href in hrefs:
                 if href:
                     full_url = f"https://www.whatnot.com{href}"
                     sellers.add(full_url)
@@ -163,54 +43,132 @@ def discover_sellers(page, target_count=150):
                 
     return list(sellers)
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False) # Headless=False to avoid detection sometimes
-        context = browser.new_context()
-        page = context.new_page()
+def save_records(data, json_path, csv_path=None):
+    if not data:
+        print("No data collected.")
+        return
 
-        print("Discovering sellers...")
-        seller_urls = discover_sellers(page, target_count=150)
-        
-        data = []
-        for i, url in enumerate(seller_urls):
-            print(f"Processing {i+1}/{len(seller_urls)}: {url}")
-            profile = get_profile_data(page, url)
-            
-            if profile:
-                # Filter by rating
-                # Note: some ratings might be "New" or missing
-                try:
-                    r = float(profile["Seller Rating"])
-                    if r >= 4.9:
-                        print(f"  -> Keeping (Rating: {r})")
-                        data.append(profile)
-                    else:
-                        print(f"  -> Skipping (Rating: {r} < 4.9)")
-                except:
-                     print("  -> Skipping (Invalid Rating)")
-
-            if len(data) >= 100:
-                print("Reached 100 qualified sellers!")
-                break
-        
-        browser.close()
+    df = pd.DataFrame(data)
+    # Drop raw rating column used for filtering
+    df_final = df.drop(columns=["RawRating"])
+    
+    # Reorder columns
+    cols = ["UserID", "UserName", "Seller Rating", "Reviews", "Average Ship", "Sold", "Following", "Followers",
+            "Scraped At"]
+    df_final = df_final.reindex(columns=cols)
+    
+    if csv_path:
+        df_final.to_csv(csv_path, index=False)
+    df_final.to_json(json_path, orient="records", indent=2)
+    print(f"Data saved to {' and '.join(p for p in (csv_path, json_path) if p)}")
 
-    # Save to files
-    if data:
-        df = pd.DataFrame(data)
-        # Drop raw rating column used for filtering
-        df_final = df.drop(columns=["RawRating"])
-        
-        # Reorder columns
-        cols = ["UserID", "UserName", "Seller Rating", "Reviews", "Average Ship", "Sold", "Following", "Followers"]
-        df_final = df_final[cols]
-        
-        df_final.to_csv("whatnot_top_sellers.csv", index=False)
-        df_final.to_json("whatnot_top_sellers.json", orient="records", indent=2)
-        print("Data saved to whatnot_top_sellers.csv and whatnot_top_sellers.json")
+def main():
+    parser = argparse.ArgumentParser(description="Scrape top-rated Whatnot sellers")
+    parser.add_argument("--concurrency", type=int, default=scrape_engine.DEFAULT_CONCURRENCY,
+                        help="Number of profile pages scraped at once")
+    parser.add_argument("--rate", type=float, default=scrape_engine.DEFAULT_RATE,
+                        help="Max page loads per second per host")
+    parser.add_argument("--extract", choices=EXTRACT_MODES, default=SINGLE_PASS,
+                        help="Profile extraction: one evaluate round-trip, or the per-field locators")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_RESOURCE_PROFILE,
+                        help="Which page resources to load (text-only blocks images, fonts, media and third parties)")
+    parser.add_argument("--headed", action="store_true",
+                        help="Show the browser window (default is headless)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the queued run instead of starting over")
+    parser.add_argument("--urls", help="Seed the queue from a URL file (e.g. seller_urls.txt) instead of discovering")
+    parser.add_argument("--queue", default=QUEUE_PATH, help="Work queue database")
+    parser.add_argument("--retry-failed", action="store_true", help="Put failed URLs back in the queue")
+    parser.add_argument("--target", type=int,
+                        help="Stop after this many qualified sellers (0 = no limit; default 100, no limit with --incremental)")
+    parser.add_argument("--shard", help="Only scrape shard INDEX/TOTAL of the URLs (see shard.py)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-scrape sellers whose TTL expired and only emit the ones that changed")
+    args = parser.parse_args()
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard_spec(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if not (args.urls or args.resume):
+            parser.error("--shard needs --urls or --resume so every worker splits the same URL set")
+        if args.queue == QUEUE_PATH:
+            args.queue = shard_queue_path(shard[0])
+
+    if args.target is None:
+        # A refresh has to see every due seller, or changes past the target would wait a whole TTL
+        args.target = 0 if args.incremental else 100
+    target = args.target or math.inf
+    work_queue = WorkQueue(args.queue)
+
+    if args.resume:
+        print(f"Resuming from {args.queue}...")
     else:
-        print("No data collected.")
+        work_queue.reset()
+
+    if args.urls:
+        urls = load_url_file(args.urls)
+        if shard:
+            urls = urls_for_shard(urls, *shard)
+            print(f"Shard {shard[0]}/{shard[1]}: {len(urls)} URLs")
+    elif not args.resume:
+        with BrowserSession(headless=not args.headed, resource_profile=args.resources) as session:
+            with session.context() as context:
+                page = context.new_page()
+
+                print("Discovering sellers...")
+                urls = discover_sellers(page, target_count=150)
+            print(session.resource_filter.report())
+    else:
+        urls = []
+
+    freshness = FreshnessStore() if args.incremental else None
+    if freshness:
+        due = freshness.due(urls, user_id_from_url)
+        print(f"Incremental: {len(due)} of {len(urls)} sellers are due for a re-scrape")
+        urls = due
+    added = work_queue.enqueue(urls)
+    if added:
+        print(f"Queued {added} new URLs")
+
+    if args.retry_failed:
+        print(f"Retrying {work_queue.retry_failed()} failed URLs")
+
+    counts = work_queue.counts()
+    print("Queue: " + ", ".join(f"{n} {state}" for state, n in counts.items()))
+
+    remaining = target - counts[DONE]
+    pending = work_queue.pending()
+    if remaining > 0 and pending:
+        asyncio.run(scrape_engine.run(
+            pending,
+            concurrency=args.concurrency,
+            rate_per_sec=args.rate,
+            min_rating=4.9,
+            target=remaining,
+            extract_mode=args.extract,
+            resource_profile=args.resources,
+            headless=not args.headed,
+            work_queue=work_queue,
+            freshness=freshness,
+        ))
+
+    # Everything kept so far, including earlier runs of a resumed queue
+    data = work_queue.records()
+    work_queue.close()
+    if freshness:
+        freshness.close()
+
+    # Incremental runs only hold what changed, so they go out as a new batch for process_data.py
+    stamp = time.strftime('%Y%m%d_%H%M%S') if args.incremental else None
+    if shard:
+        save_records(data, json_path=batch_path(shard[0], stamp))
+    elif stamp:
+        save_records(data, json_path=f"batch_incr_{stamp}.json")
+    else:
+        save_records(data, json_path="whatnot_top_sellers.json", csv_path="whatnot_top_sellers.csv")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,235 @@
+"""
+HTTP/JSON API for the rule-based seller bot
+The dataset, lookup index and rankings are loaded once into a SellerCatalog
+shared by every request; each request only slices it. A CatalogReloader swaps
+in a new catalog when the pipeline writes a new store, and each request sticks
+to the catalog it started with. "Why?" context is kept per session
+(X-Session-Id header) in a bounded LRU.
+
+    GET  /sellers/{user_id}   evaluation for one seller (404 with suggestions)
+    GET  /query?q=...         leaderboard / filtered question ("top 5 with over 10K sold")
+    GET  /best                the #1 approved seller
+    GET  /recommend           approved sellers (?limit=&offset=)
+    GET  /why                 explanation of this session's last answer
+    POST /ask {"q": "..."}    any question, routed like the chatbot
+"""
+import argparse
+import os
+import uuid
+from collections import OrderedDict
+
+from aiohttp import web
+
+from query_engine import describe, execute, has_metric_filters, parse_query
+from seller_bot import BEST_WORDS, LEADERBOARD_WORDS, MIN_RATING, MIN_REVIEWS, RECOMMEND_WORDS, WHY_WORDS, thresholds
+from seller_history import HISTORY_PATH, SellerHistory
+from seller_reload import CatalogReloader
+from seller_store import CLEAN_STORE, export_record
+
+DEFAULT_PORT = 8080
+MAX_SESSIONS = 10000
+RECOMMEND_LIMIT = 100
+SESSION_HEADER = "X-Session-Id"
+
+
+class SessionContexts:
+    """Last explanation per session, evicting the least recently used past max_sessions"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._explanations = OrderedDict()
+
+    def __len__(self):
+        return len(self._explanations)
+
+    def get(self, session):
+        explanation = self._explanations.get(session)
+        if explanation is not None:
+            self._explanations.move_to_end(session)
+        return explanation
+
+    def set(self, session, explanation):
+        self._explanations[session] = explanation
+        self._explanations.move_to_end(session)
+        while len(self._explanations) > self.max_sessions:
+            self._explanations.popitem(last=False)
+
+
+def _session(request):
+    return request.headers.get(SESSION_HEADER) or uuid.uuid4().hex
+
+
+def _respond(request, session, body, explanation=None, status=200):
+    if explanation is not None:
+        request.app["sessions"].set(session, explanation)
+    return web.json_response(body, status=status, headers={SESSION_HEADER: session})
+
+
+def _int_param(request, name, default):
+    try:
+        return max(int(request.query.get(name, default)), 0)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{name} must be an integer")
+
+
+# --- Intents (each returns (body, explanation, status)) ---
+
+def lookup(app, query):
+    catalog = app["reloader"].catalog
+    seller = catalog.index.get(query)
+    if not seller:
+        matches = catalog.index.suggest(query, limit=3)
+        return {"error": f"User '{query}' not found", "suggestions": [export_record(m) for m in matches]}, None, 404
+
+    approved, reasons, _, _, _ = catalog.evaluate(seller)
+    history = app["history"]
+    velocity = history.sold_velocity(seller['UserID']) if history else None
+    body = {"seller": export_record(seller), "approved": approved, "reasons": reasons, "sold_per_day": velocity}
+    if approved:
+        explanation = f"{seller['UserName']} meets all onboarding criteria."
+    else:
+        explanation = f"{seller['UserName']} is not approved:\n" + "\n".join(f"- {r}" for r in reasons)
+    return body, explanation, 200
+
+
+def query(app, text):
+    plan = parse_query(text)
+    results = execute(plan, app["reloader"].catalog)
+    body = {
+        "filters": [f._asdict() for f in plan.filters],
+        "sort": [k._asdict() for k in plan.sort],
+        "limit": plan.limit,
+        "sellers": [export_record(s) for s in results],
+    }
+    return body, f"{describe(plan)}\n{len(results)} sellers were listed.", 200
+
+
+def best(app):
+    seller = app["reloader"].catalog.best()
+    if not seller:
+        return {"seller": None}, None, 200
+    explanation = (
+        f"I recommended {seller['UserName']} because they satisfy the strict filtering "
+        f"(Rating >= {MIN_RATING}, Reviews >= {MIN_REVIEWS}) and have the highest rating "
+        f"({seller['Seller Rating']}), with Sales Volume ({seller['Sold']}) breaking ties."
+    )
+    return {"seller": export_record(seller)}, explanation, 200
+
+
+def recommend(app, limit=RECOMMEND_LIMIT, offset=0):
+    approved = app["reloader"].catalog.approved()
+    body = {"total": len(approved), "sellers": [export_record(s) for s in approved[offset:offset + limit]]}
+    explanation = (
+        f"I listed sellers with Rating >= {MIN_RATING} and Reviews >= {MIN_REVIEWS}.\n"
+        f"Found {len(approved)} sellers fitting this description."
+    )
+    return body, explanation, 200
+
+
+# --- Handlers ---
+
+async def handle_seller(request):
+    session = _session(request)
+    body, explanation, status = lookup(request.app, request.match_info["user_id"])
+    return _respond(request, session, body, explanation, status)
+
+
+async def handle_query(request):
+    session = _session(request)
+    text = request.query.get("q", "")
+    if not text.strip():
+        raise web.HTTPBadRequest(text="q is required")
+    body, explanation, status = query(request.app, text)
+    return _respond(request, session, body, explanation, status)
+
+
+async def handle_best(request):
+    session = _session(request)
+    return _respond(request, session, *best(request.app))
+
+
+async def handle_recommend(request):
+    session = _session(request)
+    body, explanation, status = recommend(request.app, _int_param(request, "limit", RECOMMEND_LIMIT),
+                                          _int_param(request, "offset", 0))
+    return _respond(request, session, body, explanation, status)
+
+
+async def handle_why(request):
+    session = _session(request)
+    explanation = request.app["sessions"].get(session)
+    if explanation is None:
+        return _respond(request, session, {"error": "No answer to explain yet for this session"}, status=404)
+    return _respond(request, session, {"explanation": explanation})
+
+
+async def handle_ask(request):
+    """Free-text question, routed through the same intents (and order) as seller_bot"""
+    session = _session(request)
+    try:
+        text = str((await request.json())["q"]).strip()
+    except (ValueError, KeyError, TypeError):
+        raise web.HTTPBadRequest(text='Expected a JSON body like {"q": "top 5 by sold"}')
+    if not text:
+        raise web.HTTPBadRequest(text="q is required")
+    q_lower = text.lower()
+    app = request.app
+
+    if any(w in q_lower for w in WHY_WORDS):
+        explanation = app["sessions"].get(session)
+        body = {"intent": "why", "explanation": explanation}
+        return _respond(request, session, body, status=200 if explanation else 404)
+    if any(w in q_lower for w in BEST_WORDS):
+        intent, (body, explanation, status) = "best", best(app)
+    elif has_metric_filters(parse_query(text)) or any(w in q_lower for w in LEADERBOARD_WORDS):
+        intent, (body, explanation, status) = "query", query(app, text)
+    elif any(w in q_lower for w in RECOMMEND_WORDS):
+        intent, (body, explanation, status) = "recommend", recommend(app)
+    else:
+        intent, (body, explanation, status) = "lookup", lookup(app, text)
+    return _respond(request, session, dict(body, intent=intent), explanation, status)
+
+
+async def _start_reloader(app):
+    app["reloader"].start()
+
+
+async def _cleanup(app):
+    app["reloader"].stop()
+    if app["history"]:
+        app["history"].close()
+
+
+def create_app(store=CLEAN_STORE, history_path=HISTORY_PATH, max_sessions=MAX_SESSIONS):
+    """Load the catalog and build the app around it; the catalog reloads when the store changes"""
+    app = web.Application()
+    app["reloader"] = CatalogReloader(store, thresholds())
+    app["history"] = SellerHistory(history_path) if os.path.exists(history_path) else None
+    app["sessions"] = SessionContexts(max_sessions)
+    app.on_startup.append(_start_reloader)
+    app.on_cleanup.append(_cleanup)
+    app.add_routes([
+        web.get("/sellers/{user_id}", handle_seller),
+        web.get("/query", handle_query),
+        web.get("/best", handle_best),
+        web.get("/recommend", handle_recommend),
+        web.get("/why", handle_why),
+        web.post("/ask", handle_ask),
+    ])
+    print(f"Loaded {len(app['reloader'].catalog)} sellers from {store}")
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the seller bot as a JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--input", default=CLEAN_STORE, help="Seller store (or legacy .json) to serve")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS,
+                        help="Sessions whose 'why?' context is kept (least recently used are dropped)")
+    args = parser.parse_args()
+    web.run_app(create_app(args.input, max_sessions=args.max_sessions), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
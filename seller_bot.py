@@ -1,68 +1,43 @@
 
-import json
 import os
 
+from seller_history import HISTORY_PATH, SellerHistory
+from query_engine import METRIC_NAMES, describe, execute, has_metric_filters, parse_query
+from seller_catalog import Thresholds, evaluate
+from seller_reload import CatalogReloader
+from seller_store import CLEAN_STORE, load_sellers
+
 # --- Onboarding Thresholds ---
 # User Rules: Rating >= 4.9 AND Reviews > 500
 MIN_RATING = 4.9
 MIN_SOLD = 100 # Kept as baseline
 MIN_REVIEWS = 500
 
-def load_data(filename):
-    if not os.path.exists(filename):
-        print(f"Error: {filename} not found.")
-        return []
-    with open(filename, 'r') as f:
-        return json.load(f)
+# Intent keywords, checked in this order (a username lookup is the fallback)
+WHY_WORDS = ['why', 'reason', 'explain', 'how come']
+BEST_WORDS = ['best seller', 'recommend one', 'give me one', 'best one', 'recommend only one', 'answer']
+LEADERBOARD_WORDS = ['top', 'best', 'most', 'worst', 'sort']
+RECOMMEND_WORDS = ['recommend', 'onboard', 'approved', 'good sellers', 'qualify']
 
-def parse_number(s):
-    if not s or s == "N/A":
-        return 0
-    s = str(s).strip().upper()
-    multiplier = 1
-    if s.endswith('K'):
-        multiplier = 1000
-        s = s[:-1]
-    elif s.endswith('M'):
-        multiplier = 1000000
-        s = s[:-1]
-    
+def load_data(filename=CLEAN_STORE):
     try:
-        val = float(s.replace('<', '').replace('>', ''))
-        return val * multiplier
-    except ValueError:
-        return 0
+        return load_sellers(filename)
+    except FileNotFoundError as e:
+        print(f"Error: {e.args[0]} not found.")
+        return []
 
-def evaluate_seller(seller):
-    rating = seller.get('Seller Rating')
-    sold_raw = seller.get('Sold', '0')
-    reviews_raw = seller.get('Reviews', '0')
-    
-    sold_count = parse_number(sold_raw)
-    review_count = parse_number(reviews_raw)
-    
-    reasons = []
-    
-    # Rating Check
-    if rating < MIN_RATING:
-        reasons.append(f"Rating {rating} is below {MIN_RATING}")
-        
-    # Sales Check
-    if sold_count < MIN_SOLD:
-        reasons.append(f"Sales volume ({sold_raw}) is too low (< {MIN_SOLD})")
-        
-    # Reviews Check
-    if review_count < MIN_REVIEWS:
-        reasons.append(f"Review count ({reviews_raw}) is too low (< {MIN_REVIEWS})")
+def thresholds():
+    return Thresholds(MIN_RATING, MIN_SOLD, MIN_REVIEWS)
 
-    is_approved = len(reasons) == 0
-    return is_approved, reasons, rating, sold_raw, reviews_raw
+def evaluate_seller(seller):
+    return evaluate(seller, thresholds())
 
 def main():
     print("Loading seller data...")
-    sellers = load_data('clean_seller_data.json')
-    seller_map = {s['UserID'].lower(): s for s in sellers}
-    seller_map.update({s['UserName'].lower(): s for s in sellers}) # Allow searching by Display Name
+    # Lookup index, evaluations and per-metric rankings, rebuilt in the background
+    # whenever the pipeline writes a new clean store
+    reloader = CatalogReloader(CLEAN_STORE, thresholds()).start()
+    history = SellerHistory(HISTORY_PATH) if os.path.exists(HISTORY_PATH) else None
 
     print(f"\n--- 🤖 Seller Onboarding Chatbot ---")
     print(f"Criteria: Rating >= {MIN_RATING} | Reviews >= {MIN_REVIEWS}")
@@ -80,12 +55,15 @@ def main():
         
         if not query:
             continue
+
+        # One catalog per question, even if a reload swaps in a new one meanwhile
+        catalog = reloader.catalog
         
         # --- Smart Query Parser ---
         q_lower = query.lower()
 
         # 0. Context Handler (Why?)
-        if any(w in q_lower for w in ['why', 'reason', 'explain', 'how come']):
+        if any(w in q_lower for w in WHY_WORDS):
             if last_explanation:
                 print("\n🤖 CONTEXTUAL ANSWER:")
                 print(last_explanation)
@@ -95,24 +73,13 @@ def main():
             continue
 
         # Detect "Best" or "One" recommender (Prioritize this!)
-        if any(w in q_lower for w in ['best seller', 'recommend one', 'give me one', 'best one', 'recommend only one', 'answer']):
-            # Filter first
-            candidates = []
-            for s in sellers:
-                is_ok, _, rating_val, sold_str, reviews_str = evaluate_seller(s)
-                if is_ok:
-                    # Enrich with numeric values for sorting
-                    s['_rating_num'] = rating_val
-                    s['_sold_num'] = parse_number(sold_str)
-                    s['_reviews_num'] = parse_number(reviews_str)
-                    candidates.append(s)
+        if any(w in q_lower for w in BEST_WORDS):
+            # Qualified sellers by Rating (Desc) then Sold (Desc), precomputed by the catalog
+            best_seller = catalog.best()
             
-            if not candidates:
+            if not best_seller:
                  print(f"❌ No sellers meet the strict criteria (Rating >= {MIN_RATING}, Reviews >= {MIN_REVIEWS})")
                  continue
-
-            # Sort by Rating (Desc) then Sold (Desc)
-            best_seller = sorted(candidates, key=lambda x: (x['_rating_num'], x['_sold_num']), reverse=True)[0]
             
             # SAVE CONTEXT
             last_explanation = (
@@ -137,76 +104,41 @@ def main():
             print("=" * 50)
             continue
         
-        # Detect "Top X" or "Best X" intent (Leaderboard)
-        if any(w in q_lower for w in ['top', 'best', 'most', 'worst', 'sort']):
-            
-            # 1. Determine Metric
-            metric_key = 'Seller Rating' # Default
-            metric_name = "Rating"
-            reverse_sort = True
-            
-            if 'sold' in q_lower or 'sales' in q_lower:
-                metric_key = 'Sold'
-                metric_name = "Items Sold"
-            elif 'review' in q_lower:
-                metric_key = 'Reviews'
-                metric_name = "Review Count"
-            elif 'rating' in q_lower:
-                metric_key = 'Seller Rating'
-                metric_name = "Rating"
-            
-            # 2. Determine Count (N)
-            count = 10 # Default
-            import re
-            numbers = re.findall(r'\d+', q_lower)
-            if numbers:
-                count = int(numbers[0])
-            
+        # Detect "Top X" / "Best X" leaderboards and filtered questions
+        # ("top 5 sellers with rating 5.0 and over 10K sold shipping in 1d")
+        plan = parse_query(query)
+        if has_metric_filters(plan) or any(w in q_lower for w in LEADERBOARD_WORDS):
+            results = execute(plan, catalog)
+            primary = plan.sort[0].metric
+
             # SAVE CONTEXT
             last_explanation = (
-                f"I showed you the Top {count} users sorted by {metric_name}.\n"
-                f"I looked at the '{metric_key}' field for all users and ordered them descending."
+                f"I showed you up to {plan.limit} users sorted by {METRIC_NAMES[primary]}.\n"
+                f"{describe(plan)}\n"
+                f"{len(results)} sellers were listed."
             )
 
-            # 3. Sort and Slice
-            # Helper to get sort value safely
-            def get_sort_val(s):
-                val = s.get(metric_key)
-                if metric_key in ['Sold', 'Reviews']:
-                    return parse_number(val)
-                # For Rating, ensure numeric
-                try:
-                    return float(val) if val else 0
-                except:
-                    return 0
-
-            sorted_sellers = sorted(sellers, key=get_sort_val, reverse=reverse_sort)
-            top_n = sorted_sellers[:count]
-            
-            # 4. Display Leaderboard
-            print(f"\n🏆 TOP {count} BY {metric_name.upper()}")
-            print(f"{'#':<4} {'User':<25} {'Metric':<15}")
-            print("-" * 45)
-            for i, s in enumerate(top_n, 1):
-                val = s.get(metric_key, 'N/A')
-                print(f"{i:<4} {s['UserName'][:24]:<25} {val:<15}")
-            print("-" * 45)
+            print(f"\n🏆 TOP {len(results)} BY {METRIC_NAMES[primary].upper()}")
+            print(f"{'#':<4} {'User':<25} {'Rating':<8} {'Sold':<10} {'Reviews':<10} {'Ship'}")
+            print("-" * 65)
+            for i, s in enumerate(results, 1):
+                print(f"{i:<4} {s['UserName'][:24]:<25} {str(s.get('Seller Rating', 'N/A')):<8} "
+                      f"{str(s.get('Sold', 'N/A')):<10} {str(s.get('Reviews', 'N/A')):<10} {s.get('Average Ship', 'N/A')}")
+            if not results:
+                print("No sellers match those filters.")
+            print("-" * 65)
             continue
 
-
-
         # Detect "Onboarding" or "Recommend" intent (Show ALL approved)
-        if any(w in q_lower for w in ['recommend', 'onboard', 'approved', 'good sellers', 'qualify']):
+        if any(w in q_lower for w in RECOMMEND_WORDS):
             print(f"\n✨ RECOMMENDED SELLERS (Rating >= {MIN_RATING}, Reviews >= {MIN_REVIEWS})")
             print(f"{'User':<25} {'Rating':<8} {'Reviews':<10} {'Sold'}")
             print("-" * 60)
             
-            approved_count = 0
-            for s in sellers:
-                is_ok, _, r, so, rev = evaluate_seller(s)
-                if is_ok:
-                    approved_count += 1
-                    print(f"{s['UserName'][:24]:<25} {r:<8} {rev:<10} {so}")
+            approved = catalog.approved()
+            approved_count = len(approved)
+            for s in approved:
+                print(f"{s['UserName'][:24]:<25} {s['Seller Rating']:<8} {s['Reviews']:<10} {s['Sold']}")
             
             # SAVE CONTEXT
             last_explanation = (
@@ -223,33 +155,28 @@ def main():
             print("-" * 60)
             continue
 
-        seller = seller_map.get(query.lower())
+        seller = catalog.index.get(query)
         
         if not seller:
-            # Try partial match if exact match fails
-            matches = [s for name, s in seller_map.items() if query.lower() in name]
+            # Prefix or close (typo-tolerant) matches if exact match fails
+            matches = catalog.index.suggest(query, limit=3)
             if matches:
                 print(f"❓ User '{query}' not found exactly. Did you mean one of these?")
-                seen = set()
-                count = 0
                 for m in matches:
-                     uname = m['UserName']
-                     uid = m['UserID']
-                     if uid in seen: continue
-                     seen.add(uid)
-                     print(f"   - {uname} ({uid})")
-                     count += 1
-                     if count >= 3: break
+                    print(f"   - {m['UserName']} ({m['UserID']})")
             else:
                 print(f"❌ User '{query}' not found in database.")
             continue
 
         # Evaluation
-        approved, reasons, rating, sold, reviews = evaluate_seller(seller)
+        approved, reasons, rating, sold, reviews = catalog.evaluate(seller)
         
         print("\n-------------------------------------")
         print(f"👤 Seller: {seller['UserName']} (@{seller['UserID']})")
         print(f"📊 Stats:  Rating: {rating} ★ | Sold: {sold} | Reviews: {reviews}")
+        velocity = history.sold_velocity(seller['UserID']) if history else None
+        if velocity is not None:
+            print(f"📈 Trend:  ~{velocity:,.0f} sold/day across {len(history.snapshots(seller['UserID']))} scrapes")
         
         if approved:
              print(f"✅ RESULT: APPROVED FOR ONBOARDING")
@@ -3,53 +3,54 @@ import os
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from enrichment_store import STORE_PATH as ENRICHMENT_STORE, load_enrichment
+from seller_bot import WHY_WORDS, thresholds
+from seller_reload import CatalogReloader, FileReloader
+from seller_retrieval import build_context
+from seller_store import CLEAN_STORE
+
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# Initialize OpenAI client (OPENAI_BASE_URL points it at any compatible endpoint, e.g. a local stub)
+client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), base_url=os.getenv('OPENAI_BASE_URL'))
+MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')  # gpt-4o-mini for cost efficiency
 
 # --- Onboarding Thresholds ---
 MIN_RATING = 4.9
 MIN_REVIEWS = 500
 
-def load_seller_data():
-    """Load and return the clean seller data, merged with enrichment data where available"""
-    # Load base data
-    with open('clean_seller_data.json', 'r') as f:
-        sellers = json.load(f)
-    
-    # Load enriched data if available
-    try:
-        with open('enriched_top_5.json', 'r') as f:
-            enriched_list = json.load(f)
-            # Create a map for easy lookup
-            enriched_map = {s['UserID']: s.get('enrichment') for s in enriched_list}
-            
-            # Merge enrichment into main list
-            for s in sellers:
-                if s['UserID'] in enriched_map:
-                    s['enrichment'] = enriched_map[s['UserID']]
-    except FileNotFoundError:
-        print("Warning: enriched_top_5.json not found. enrichment data will be missing.")
-
-    return sellers
-
-def create_system_prompt(sellers):
-    """Create a system prompt that explains the data and rules to the LLM"""
-    return f"""You are an intelligent seller onboarding assistant. You have access to a dataset of {len(sellers)} Whatnot sellers.
+MAX_TURNS = 10  # earlier user/assistant turns resent with each question
+
+def load_enrichment_map():
+    """UserID -> enrichment for every seller the scheduler has covered"""
+    enriched_map = load_enrichment()
+    if not enriched_map:
+        # Older runs only produced the top 5 file
+        try:
+            with open('enriched_top_5.json', 'r') as f:
+                enriched_map = {s['UserID']: s.get('enrichment') for s in json.load(f)}
+        except FileNotFoundError:
+            print(f"Warning: {ENRICHMENT_STORE} not found. enrichment data will be missing.")
+    return enriched_map
+
+def create_system_prompt(catalog):
+    """Create a system prompt that explains the data and rules to the LLM (the sellers come per question)"""
+    return f"""You are an intelligent seller onboarding assistant. You have access to a dataset of {len(catalog)} Whatnot sellers, {len(catalog.approved())} of which meet the onboarding criteria.
 
 ONBOARDING CRITERIA:
 - Rating must be >= {MIN_RATING}
 - Reviews must be >= {MIN_REVIEWS}
 
-DATASET STRUCTURE:
-Each seller has: UserID, UserName, Seller Rating, Reviews, Sold.
-SOME sellers (the top candidates) have an 'enrichment' field containing:
-- 'reddit_mentions': List of Reddit comments
-- 'sentiment_analysis': Positive/Negative scores
-- 'pricing_analysis': Competitive status and estimated range
-- 'listing_quality': Score (e.g. 9.5/10) and details
+SELLER CONTEXT:
+Before each question you get a SELLER CONTEXT message with the sellers retrieved for it
+(the ones it names, then the best matches for its filters and ranking), one JSON object per line:
+UserID, UserName, Rating, Sold, Reviews, Followers, Ship, approved.
+Sellers that have been enriched also have an 'enrichment' object containing:
+- 'sentiment', 'mentions', 'positive', 'negative': Reddit sentiment summary
+- 'sample_mentions': A few Reddit comments
+- 'pricing': Competitive status
+- 'listing_quality': Score (e.g. 9.5/10)
 
 YOUR CAPABILITIES:
 1. Answer ANY question about the sellers
@@ -58,20 +59,18 @@ YOUR CAPABILITIES:
 4. **Answer questions about Sentiment, Social Media, Listing Quality, and Pricing** using the 'enrichment' data if available.
 
 IMPORTANT RULES:
-- If a user asks about social media/sentiment for a seller WITHOUT enrichment data, say "I don't have deeper analytics for that specific seller yet, only the top candidates."
-- If asked for N sellers, return EXACTLY N sellers
+- Only use sellers from the SELLER CONTEXT (or earlier in this conversation). If a seller isn't there, say you couldn't find them.
+- If a user asks about social media/sentiment for a seller WITHOUT enrichment data, say "I don't have deeper analytics for that specific seller yet, only for enriched sellers that meet the criteria."
+- If asked for N sellers, return EXACTLY N sellers (fewer only if fewer are in the context)
 - Always explain WHY you chose specific sellers
 
-SELLER DATA (JSON):
-{json.dumps(sellers, indent=2)}
-
 Remember: Be helpful, accurate, and conversational."""
 
 def chat_with_llm(messages):
     """Send messages to OpenAI and get a response"""
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using gpt-4o-mini for cost efficiency
+            model=MODEL,
             messages=messages,
             temperature=0.7,
             max_tokens=1000
@@ -80,14 +79,38 @@ def chat_with_llm(messages):
     except Exception as e:
         return f"❌ Error communicating with OpenAI: {str(e)}\nPlease check your API key in the .env file."
 
+def ask(user_input, catalog, enrichment_map, conversation_history, last_context=None):
+    """
+    One turn: retrieve the sellers for the question, send it with the recent
+    turns, and add the exchange to conversation_history. Returns (response, context).
+    """
+    # Follow-ups like "why?" are about the sellers already in front of the model
+    if last_context and any(w in user_input.lower() for w in WHY_WORDS):
+        context = last_context
+    else:
+        context = build_context(user_input, catalog, enrichment_map)
+
+    messages = (
+        [{"role": "system", "content": create_system_prompt(catalog)}]
+        + conversation_history[-2 * MAX_TURNS:]
+        + [{"role": "system", "content": context}, {"role": "user", "content": user_input}]
+    )
+    response = chat_with_llm(messages)
+
+    conversation_history.append({"role": "user", "content": user_input})
+    conversation_history.append({"role": "assistant", "content": response})
+    return response, context
+
 def main():
     print("Loading seller data...")
-    sellers = load_seller_data()
+    # Reloads the clean store in the background when the pipeline rewrites it
+    reloader = CatalogReloader(CLEAN_STORE, thresholds()).start()
+    # enrich_sellers.py writes one seller at a time, usually without touching the clean store
+    enrichment = FileReloader(ENRICHMENT_STORE, load_enrichment_map).start()
     
-    # Initialize conversation history
-    conversation_history = [
-        {"role": "system", "content": create_system_prompt(sellers)}
-    ]
+    # User/assistant turns only; seller data is retrieved fresh for every question
+    conversation_history = []
+    last_context = None
     
     print("\n--- 🤖 AI-Powered Seller Onboarding Assistant ---")
     print(f"Criteria: Rating >= {MIN_RATING} | Reviews >= {MIN_REVIEWS}")
@@ -103,14 +126,9 @@ def main():
         if not user_input:
             continue
         
-        # Add user message to history
-        conversation_history.append({"role": "user", "content": user_input})
-        
-        # Get AI response
-        response = chat_with_llm(conversation_history)
-        
-        # Add assistant response to history
-        conversation_history.append({"role": "assistant", "content": response})
+        # New data: pick up the new catalog and enrichment, keeping the conversation so far
+        catalog = reloader.catalog
+        response, last_context = ask(user_input, catalog, enrichment.value, conversation_history, last_context)
         
         # Print response
         print(f"\n{response}\n")
@@ -0,0 +1,148 @@
+"""
+Loaded seller dataset with everything the bot's intents need precomputed
+One build per dataset: the lookup index, a numeric array per metric, and a
+descending rank array per metric. Onboarding approval is a vectorized mask
+over those arrays, cached per set of thresholds, so "best seller",
+leaderboards and "recommend" are slices rather than full re-evaluations.
+A new dataset means a new catalog; new thresholds only re-run the mask.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from metrics import parse_days
+from seller_index import SellerIndex
+from seller_store import parsed_count
+
+Thresholds = namedtuple("Thresholds", "min_rating min_sold min_reviews")
+
+TIE_BREAKERS = ("rating", "sold")  # rankings break ties by these, highest first
+
+# metric -> scraped field it ranks by
+METRICS = {
+    "rating": "Seller Rating",
+    "sold": "Sold",
+    "reviews": "Reviews",
+    "followers": "Followers",
+    "ship": "Average Ship",
+}
+
+
+def evaluate(seller, thresholds):
+    """(is_approved, reasons, rating, sold_raw, reviews_raw) for one seller"""
+    rating = seller.get('Seller Rating')
+    sold_raw = seller.get('Sold', '0')
+    reviews_raw = seller.get('Reviews', '0')
+
+    sold_count = parsed_count(seller, 'Sold')
+    review_count = parsed_count(seller, 'Reviews')
+
+    reasons = []
+
+    # Rating Check
+    if rating is None or rating < thresholds.min_rating:
+        reasons.append(f"Rating {rating} is below {thresholds.min_rating}")
+
+    # Sales Check
+    if sold_count < thresholds.min_sold:
+        reasons.append(f"Sales volume ({sold_raw}) is too low (< {thresholds.min_sold})")
+
+    # Reviews Check
+    if review_count < thresholds.min_reviews:
+        reasons.append(f"Review count ({reviews_raw}) is too low (< {thresholds.min_reviews})")
+
+    is_approved = len(reasons) == 0
+    return is_approved, reasons, rating, sold_raw, reviews_raw
+
+
+class SellerCatalog:
+    def __init__(self, sellers, thresholds, previous=None):
+        """
+        `previous` is the catalog for an earlier version of the dataset; sellers
+        carried over from it unchanged (the same dict objects) reuse its work.
+        A catalog is never modified after it's built, apart from its caches.
+        """
+        self.sellers = sellers
+        self._position = {id(s): i for i, s in enumerate(sellers)}
+        self.index = SellerIndex(sellers, previous.index if previous else None)
+
+        # Sellers that need their metrics parsed; the rest are copied from `previous`
+        todo = np.arange(len(sellers))
+        if previous is not None:
+            was = np.array([previous._position.get(id(s), -1) for s in sellers], dtype=np.int64)
+            todo = np.flatnonzero(was < 0)
+            kept = np.flatnonzero(was >= 0)
+
+        # NaN where a value is missing (e.g. no rating)
+        self.values = {}
+        for metric, field in METRICS.items():
+            values = np.empty(len(sellers), dtype=np.float64)
+            if previous is not None:
+                values[kept] = previous.values[metric][was[kept]]
+            values[todo] = [self._parse(metric, field, sellers[i]) for i in todo]
+            self.values[metric] = values
+
+        # Highest first, ties broken by TIE_BREAKERS then dataset order; missing values sort last
+        self.rankings = {metric: self._rank(metric) for metric in self.values}
+
+        self.thresholds = None
+        self.set_thresholds(thresholds)
+
+    def __len__(self):
+        return len(self.sellers)
+
+    @staticmethod
+    def _parse(metric, field, seller):
+        if metric == "rating":
+            v = seller.get(field)
+            return np.nan if v is None else v
+        if metric == "ship":
+            return parse_days(seller.get(field))
+        return parsed_count(seller, field)
+
+    def _rank(self, metric):
+        keys = [np.arange(len(self.sellers))]
+        for m in reversed([metric] + [t for t in TIE_BREAKERS if t != metric]):
+            keys.append(np.nan_to_num(-self.values[m], nan=np.inf))
+        return np.lexsort(keys)
+
+    def set_thresholds(self, thresholds):
+        """Recompute approval for new thresholds; a no-op when they haven't changed"""
+        thresholds = Thresholds(*thresholds)
+        if thresholds == self.thresholds:
+            return
+        self.thresholds = thresholds
+        # NaN comparisons are False, so a missing metric never approves
+        self.approved_mask = ((self.values["rating"] >= thresholds.min_rating)
+                              & (self.values["sold"] >= thresholds.min_sold)
+                              & (self.values["reviews"] >= thresholds.min_reviews))
+        self._approved = None
+        self._best = None
+        self._evaluations = {}
+
+    def evaluate(self, seller):
+        """evaluate() for a seller in this catalog, computed once per thresholds"""
+        i = self._position[id(seller)]
+        if i not in self._evaluations:
+            self._evaluations[i] = evaluate(seller, self.thresholds)
+        return self._evaluations[i]
+
+    def approved(self):
+        """Approved sellers in dataset order"""
+        if self._approved is None:
+            self._approved = [self.sellers[i] for i in np.flatnonzero(self.approved_mask)]
+        return self._approved
+
+    def best(self):
+        """The approved seller with the top rating, highest Sold breaking ties (None if nobody qualifies)"""
+        if self._best is None:
+            candidates = np.flatnonzero(self.approved_mask)
+            if len(candidates) == 0:
+                return None
+            order = np.lexsort((-self.values["sold"][candidates], -self.values["rating"][candidates]))
+            self._best = self.sellers[candidates[order[0]]]
+        return self._best
+
+    def top(self, metric, n):
+        """The n sellers with the highest `metric`, from its precomputed ranking"""
+        return [self.sellers[i] for i in self.rankings[metric][:max(n, 0)]]
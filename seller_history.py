@@ -0,0 +1,96 @@
+"""
+Per-seller metric history
+Every scrape process_data ingests leaves a compact numeric snapshot here
+(rating, sold, reviews, followers), so trends like Sold velocity can be
+read back without keeping old full records. Also remembers which batch
+files have already been merged into the seller store.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+from metrics import parse_count
+
+HISTORY_PATH = "seller_history.db"
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'  # profile_extract's "Scraped At"
+
+
+class SellerHistory:
+    def __init__(self, path=HISTORY_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                user_id    TEXT NOT NULL,
+                scraped_at TEXT NOT NULL,
+                rating     REAL,
+                sold       REAL,
+                reviews    REAL,
+                followers  REAL,
+                PRIMARY KEY (user_id, scraped_at)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingested (
+                path  TEXT PRIMARY KEY,
+                size  INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def record(self, rows):
+        """Snapshot scraped records; a later record with the same timestamp replaces the earlier one"""
+        snapshots = []
+        for row in rows:
+            if not row.get("Scraped At"):
+                continue
+            rating = row.get("Seller Rating")
+            snapshots.append((
+                str(row.get("UserID", "")).lower(),
+                row["Scraped At"],
+                rating if isinstance(rating, (int, float)) else None,
+                parse_count(row.get("Sold"), None),
+                parse_count(row.get("Reviews"), None),
+                parse_count(row.get("Followers"), None),
+            ))
+        self.conn.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)", snapshots)
+        self.conn.commit()
+
+    def is_ingested(self, path):
+        """True if this batch file, unchanged since, was already merged"""
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT size, mtime FROM ingested WHERE path = ?", (path,)).fetchone()
+        return row is not None and row == (stat.st_size, stat.st_mtime)
+
+    def mark_ingested(self, paths):
+        rows = [(p, os.stat(p).st_size, os.stat(p).st_mtime) for p in paths]
+        self.conn.executemany("INSERT OR REPLACE INTO ingested (path, size, mtime) VALUES (?, ?, ?)", rows)
+        self.conn.commit()
+
+    def forget_ingested(self):
+        self.conn.execute("DELETE FROM ingested")
+        self.conn.commit()
+
+    def snapshots(self, user_id):
+        """[(scraped_at, rating, sold, reviews, followers)] for a seller, oldest first"""
+        return self.conn.execute(
+            "SELECT scraped_at, rating, sold, reviews, followers FROM snapshots "
+            "WHERE user_id = ? ORDER BY scraped_at", (user_id.lower(),)
+        ).fetchall()
+
+    def sold_velocity(self, user_id):
+        """Items sold per day between the first and last snapshot, or None without two dated sales counts"""
+        points = [(s[0], s[2]) for s in self.snapshots(user_id) if s[2] is not None]
+        if len(points) < 2:
+            return None
+        (first_at, first_sold), (last_at, last_sold) = points[0], points[-1]
+        try:
+            days = (datetime.strptime(last_at, TIME_FORMAT) - datetime.strptime(first_at, TIME_FORMAT)).total_seconds() / 86400
+        except ValueError:
+            return None
+        if days <= 0:
+            return None
+        return (last_sold - first_sold) / days
+
+    def close(self):
+        self.conn.close()
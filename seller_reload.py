@@ -0,0 +1,172 @@
+"""
+Hot reload of the seller catalog
+A CatalogReloader watches the clean seller store's mtime/size from a
+background thread. When the pipeline writes a new version it builds a fresh
+SellerCatalog off to the side and swaps it in with one attribute assignment,
+so a query that already holds `reloader.catalog` keeps a complete, consistent
+catalog until it finishes. Rows whose content hasn't changed keep their
+record objects, which lets the new catalog reuse the old one's parsed
+metrics and index entries; only changed sellers are rebuilt.
+A FileReloader does the same for any other file the bots read whole, such
+as the enrichment store, which changes one seller at a time.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from seller_catalog import SellerCatalog
+from seller_store import dedupe_sellers, load_frame, source_path, to_records
+
+RELOAD_INTERVAL = 2.0  # seconds between checks of the store file
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CatalogReloader:
+    """
+    reloader = CatalogReloader(CLEAN_STORE, thresholds())
+    reloader.start()
+    ...
+    catalog = reloader.catalog  # take it once per query
+    """
+
+    def __init__(self, store, thresholds, interval=RELOAD_INTERVAL):
+        self.store = store
+        self.thresholds = thresholds
+        self.interval = interval
+        self.reloads = 0
+        self.catalog = None
+        self._rows = {}  # row hash -> record, for the version currently loaded
+        self._hashes = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reload()
+
+    def changed(self):
+        """True if the store file differs from the version last loaded"""
+        return _signature(source_path(self.store)) != self._signature
+
+    def reload(self):
+        """Load the store and swap in a new catalog; returns False if no row changed"""
+        with self._lock:
+            path = source_path(self.store)
+            signature = _signature(path)
+            try:
+                df = load_frame(self.store)
+            except FileNotFoundError as e:
+                print(f"Error: {e.args[0]} not found.")
+                self._signature = signature
+                if self.catalog is None:
+                    self.catalog = SellerCatalog([], self.thresholds)
+                return False
+
+            hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+            if self._hashes is not None and np.array_equal(hashes, self._hashes):
+                self._signature = signature  # touched, not changed
+                return False
+
+            # Unchanged rows keep their record objects; only new/changed rows are converted
+            records = [self._rows.get(h) for h in hashes.tolist()]
+            fresh = [i for i, r in enumerate(records) if r is None]
+            for i, r in zip(fresh, to_records(df.iloc[fresh]) if fresh else []):
+                records[i] = r
+
+            catalog = SellerCatalog(dedupe_sellers(records), self.thresholds, previous=self.catalog)
+            self.catalog = catalog  # the swap: readers see the old catalog or the new one, never a mix
+            self._rows = dict(zip(hashes.tolist(), records))
+            self._hashes = hashes
+            self._signature = signature
+            self.reloads += 1
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            if not self.changed():
+                continue
+            start = time.perf_counter()
+            try:
+                if self.reload():
+                    print(f"\n🔄 Reloaded {len(self.catalog)} sellers from {self.store} "
+                          f"in {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                # Keep serving the catalog we have; the next change retries
+                print(f"\n⚠️ Reload of {self.store} failed: {e}")
+                self._signature = _signature(source_path(self.store))
+
+    def start(self):
+        """Watch the store from a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="catalog-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class FileReloader:
+    """
+    enrichment = FileReloader(ENRICHMENT_STORE, load_enrichment_map).start()
+    ...
+    enrichment_map = enrichment.value  # take it once per question
+
+    `load()` is re-run from a daemon thread whenever the file's mtime/size
+    changes (or it appears), and its result swapped in whole.
+    """
+
+    def __init__(self, path, load, interval=RELOAD_INTERVAL):
+        self.path = path
+        self.load = load
+        self.interval = interval
+        self.reloads = 0
+        self._signature = _signature(path)
+        self.value = load()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def changed(self):
+        return _signature(self.path) != self._signature
+
+    def reload(self):
+        signature = _signature(self.path)
+        self.value = self.load()
+        self._signature = signature
+        self.reloads += 1
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            if not self.changed():
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep what we have; the next change retries
+                print(f"\n⚠️ Reload of {self.path} failed: {e}")
+                self._signature = _signature(self.path)
+
+    def start(self):
+        """Watch the file from a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name=f"reloader-{self.path}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
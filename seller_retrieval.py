@@ -0,0 +1,130 @@
+"""
+Retrieval for the LLM bot
+Each question becomes a pre-query against the seller catalog. Sellers it
+names are found through the lookup index: runs of words matched exactly,
+or as close matches when they look like a name or handle. Filters, ranking
+and limit come from the query engine. Only those sellers go into the prompt for that turn, one compact JSON object
+per line, instead of the whole dataset.
+"""
+import json
+import re
+
+from query_engine import Filter, describe, execute, has_metric_filters, parse_query
+from seller_bot import BEST_WORDS, LEADERBOARD_WORDS, RECOMMEND_WORDS
+
+MAX_RECORDS = 25      # sellers injected per question
+NAME_SIMILARITY = 0.6  # for name-like words that aren't an exact UserID/UserName
+MAX_MENTIONS = 2
+MAX_NAME_WORDS = 4    # longest display name (in words) matched in a question
+MENTION_CHARS = 200
+
+TOKEN_RE = re.compile(r"@?[\w.\-]+")
+
+
+def _handle_like(token):
+    """@name, or a word with digits/underscores/inner capitals (e.g. CollectibleTags, kraken_hits)"""
+    return token.startswith("@") or bool(re.search(r"[\d_]|[a-z][A-Z]", token))
+
+
+def _name_like(tokens):
+    """Words that read as a name: one handle-like word, or several capitalized/handle-like ones"""
+    if len(tokens) == 1:
+        return _handle_like(tokens[0])
+    return all(t.lstrip("@")[:1].isupper() or _handle_like(t) for t in tokens)
+
+
+def _match(tokens, catalog):
+    """The seller named by exactly these words, or None"""
+    words = [t.lstrip("@").strip(".-") for t in tokens]
+    if not all(words):
+        return None
+    # "Kraken Hits" is a display name; "kraken hits" may also be the UserID krakenhits
+    for name in dict.fromkeys((" ".join(words), "".join(words))):
+        seller = catalog.index.get(name)
+        if seller is not None:
+            return seller
+    if _name_like(tokens):
+        matches = catalog.index.fuzzy(" ".join(words), limit=1, min_similarity=NAME_SIMILARITY)
+        if matches:
+            return matches[0][1]
+    return None
+
+
+def mentioned_sellers(question, catalog):
+    """
+    Sellers the question names, in the order it names them. Runs of up to
+    MAX_NAME_WORDS words are tried longest first, so multi-word display names
+    ("Seller Name 7") win over a seller called by one of their words.
+    """
+    tokens = TOKEN_RE.findall(question)
+    found, seen = [], set()
+    i = 0
+    while i < len(tokens):
+        for n in range(min(MAX_NAME_WORDS, len(tokens) - i), 0, -1):
+            seller = _match(tokens[i:i + n], catalog)
+            if seller is not None:
+                break
+        else:
+            n = 1
+        if seller is not None and id(seller) not in seen:
+            seen.add(id(seller))
+            found.append(seller)
+        i += n
+    return found
+
+
+def retrieve(question, catalog, limit=MAX_RECORDS):
+    """(sellers, plan or None): named sellers first, then the query engine's results"""
+    named = mentioned_sellers(question, catalog)
+    q_lower = question.lower()
+    plan = parse_query(question)
+    recommending = any(w in q_lower for w in RECOMMEND_WORDS + BEST_WORDS)
+    ranking = has_metric_filters(plan) or recommending or any(w in q_lower for w in LEADERBOARD_WORDS)
+    if named and not ranking:
+        return named[:limit], None
+
+    if recommending and Filter("approved", "==", True) not in plan.filters:
+        plan = plan._replace(filters=plan.filters + [Filter("approved", "==", True)])
+    plan = plan._replace(limit=min(plan.limit, limit))
+    have = {id(s) for s in named}
+    results = named + [s for s in execute(plan, catalog) if id(s) not in have]
+    return results[:limit], plan
+
+
+def compact_record(seller, catalog, enrichment=None):
+    """One seller as a single-line JSON object with only what the model needs"""
+    record = {
+        "UserID": seller['UserID'],
+        "UserName": seller.get('UserName'),
+        "Rating": seller.get('Seller Rating'),
+        "Sold": seller.get('Sold'),
+        "Reviews": seller.get('Reviews'),
+        "Followers": seller.get('Followers'),
+        "Ship": seller.get('Average Ship'),
+        "approved": catalog.evaluate(seller)[0],
+    }
+    if enrichment:
+        sentiment = enrichment.get('sentiment_analysis', {})
+        record["enrichment"] = {
+            "sentiment": sentiment.get('overall_sentiment'),
+            "mentions": sentiment.get('total_mentions', len(enrichment.get('reddit_mentions', []))),
+            "positive": sentiment.get('positive'),
+            "negative": sentiment.get('negative'),
+            "pricing": enrichment.get('pricing_analysis', {}).get('status'),
+            "listing_quality": enrichment.get('listing_quality', {}).get('score'),
+            "sample_mentions": [m['text'][:MENTION_CHARS] for m in enrichment.get('reddit_mentions', [])[:MAX_MENTIONS]],
+            "last_updated": enrichment.get('last_updated'),
+        }
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def build_context(question, catalog, enrichment_map, limit=MAX_RECORDS):
+    """The per-turn SELLER CONTEXT block for a question"""
+    sellers, plan = retrieve(question, catalog, limit)
+    lines = [f"SELLER CONTEXT ({len(sellers)} of {len(catalog)} sellers, retrieved for this question)"]
+    if plan is not None:
+        lines.append(describe(plan))
+    if not sellers:
+        lines.append("No sellers matched.")
+    lines += [compact_record(s, catalog, enrichment_map.get(s['UserID'])) for s in sellers]
+    return "\n".join(lines)
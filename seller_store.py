@@ -0,0 +1,209 @@
+"""
+Columnar seller store
+The pipeline stages hand sellers to each other through a typed Parquet file
+instead of indent=2 JSON. Counts like "3.2K" are parsed into numeric columns
+once at ingest; the scraped strings are kept alongside for display.
+JSON and CSV are only written as exports.
+Without pyarrow the store falls back to JSON Lines with the same schema.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from metrics import parse_count, parse_counts
+
+SELLER_STORE = "seller_data"
+CLEAN_STORE = "clean_seller_data"
+
+# Columns as scraped, in export order
+EXPORT_COLUMNS = ["UserID", "UserName", "Seller Rating", "Reviews", "Average Ship",
+                  "Sold", "Following", "Followers", "Scraped At"]
+TEXT_COLUMNS = [c for c in EXPORT_COLUMNS if c != "Seller Rating"]
+
+# Scraped count column -> its parsed numeric column
+NUMERIC_COLUMNS = {
+    "Sold": "_sold_num",
+    "Reviews": "_reviews_num",
+    "Following": "_following_num",
+    "Followers": "_followers_num",
+}
+COLUMNS = EXPORT_COLUMNS + list(NUMERIC_COLUMNS.values())
+
+if pa is not None:
+    SCHEMA = pa.schema(
+        [(c, pa.float64()) if c == "Seller Rating" else (c, pa.string()) for c in EXPORT_COLUMNS]
+        + [(c, pa.float64()) for c in NUMERIC_COLUMNS.values()]
+    )
+
+def store_path(name):
+    """File backing a store name, e.g. clean_seller_data -> clean_seller_data.parquet"""
+    if name.endswith((".parquet", ".jsonl")):
+        return name
+    return _stem(name) + (".parquet" if pa is not None else ".jsonl")
+
+
+def _stem(name):
+    for ext in (".parquet", ".jsonl", ".json"):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def build_frame(records):
+    """Typed DataFrame from scraped/exported seller dicts; numeric columns parsed here, once"""
+    df = pd.DataFrame.from_records(list(records))
+    for c in EXPORT_COLUMNS:
+        if c not in df:
+            df[c] = None
+    df = df[EXPORT_COLUMNS].copy()
+
+    for c in TEXT_COLUMNS:
+        df[c] = df[c].where(df[c].isna(), df[c].astype(str)).astype(object)
+    df["Seller Rating"] = pd.to_numeric(df["Seller Rating"], errors="coerce")
+    for raw, num in NUMERIC_COLUMNS.items():
+        df[num], _ = parse_counts(df[raw])
+    return df.reset_index(drop=True)
+
+
+def _typed(df):
+    for c in ["Seller Rating"] + list(NUMERIC_COLUMNS.values()):
+        if c in df:
+            df[c] = df[c].astype(np.float64)
+    return df
+
+
+def save_frame(df, name):
+    """Write a seller frame to its store; returns the file written"""
+    path = store_path(name)
+    tmp = path + ".tmp"
+    if pa is not None:
+        table = pa.Table.from_pandas(df[COLUMNS], schema=SCHEMA, preserve_index=False)
+        pq.write_table(table, tmp)
+    else:
+        df[COLUMNS].to_json(tmp, orient="records", lines=True)
+    os.replace(tmp, path)
+    return path
+
+
+class StoreWriter:
+    """
+    Writes a store a chunk of records at a time (one Parquet row group per chunk),
+    for stages that stream sellers rather than hold them all.
+    The store is only replaced once close() is called.
+    """
+
+    def __init__(self, name):
+        self.path = store_path(name)
+        self.tmp = self.path + ".tmp"
+        self.rows = 0
+        if pa is not None:
+            self._writer = pq.ParquetWriter(self.tmp, SCHEMA)
+        else:
+            self._writer = open(self.tmp, "w")
+
+    def write(self, records):
+        df = build_frame(records)
+        if df.empty:
+            return
+        if pa is not None:
+            self._writer.write_table(pa.Table.from_pandas(df[COLUMNS], schema=SCHEMA, preserve_index=False))
+        else:
+            lines = df[COLUMNS].to_json(orient="records", lines=True)
+            self._writer.write(lines if lines.endswith("\n") else lines + "\n")
+        self.rows += len(df)
+
+    def close(self):
+        self._writer.close()
+        os.replace(self.tmp, self.path)
+        return self.path
+
+
+def source_path(name):
+    """The file load_frame reads for a store: the store itself, else a legacy <name>.json"""
+    path = store_path(name)
+    legacy = _stem(name) + ".json"
+    return legacy if not os.path.exists(path) and os.path.exists(legacy) else path
+
+
+def load_frame(name, columns=None):
+    """
+    Read a seller store (memory-mapped Parquet, reading only `columns` if given).
+    A name with no store yet but a legacy <name>.json next to it is built from that.
+    """
+    path = source_path(name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            df = build_frame(json.load(f))
+        return df[columns] if columns else df
+
+    if path.endswith(".parquet"):
+        df = pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    else:
+        df = pd.read_json(path, orient="records", lines=True, dtype=False)
+        if columns:
+            df = df[columns]
+    return _typed(df)
+
+
+def dedupe_sellers(records):
+    """One record per UserID (case-insensitive), keeping the newest "Scraped At"; order of first appearance"""
+    latest = {}
+    for r in records:
+        key = str(r.get("UserID", "")).lower()
+        if key not in latest or (r.get("Scraped At") or "") >= (latest[key].get("Scraped At") or ""):
+            latest[key] = r
+    return list(latest.values())
+
+
+def parsed_count(seller, field):
+    """A seller dict's numeric count for a scraped field, from the store column when it's there"""
+    num = NUMERIC_COLUMNS.get(field)
+    if num and seller.get(num) is not None:
+        return seller[num]
+    return parse_count(seller.get(field))
+
+
+def iter_records(name, batch_size=10000):
+    """Stream a store's rows as dicts, in stored order, without loading the whole file"""
+    path = store_path(name)
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+    else:
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def to_records(df):
+    """List of plain dicts, with NaN/missing values as None"""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def export_record(seller):
+    """A seller dict with only the export columns (no internal numeric columns)"""
+    return {c: seller.get(c) for c in EXPORT_COLUMNS}
+
+
+def load_sellers(name, columns=None):
+    return to_records(load_frame(name, columns))
+
+
+def export_json(df, path):
+    with open(path, "w") as f:
+        json.dump(to_records(df[EXPORT_COLUMNS]), f, indent=2)
+
+
+def export_csv(df, path, na_rep="N/A"):
+    df[EXPORT_COLUMNS].to_csv(path, index=False, na_rep=na_rep)
@@ -0,0 +1,176 @@
+"""
+Batched sentiment scoring
+Scores a batch of texts into a NumPy polarity array (each distinct text once,
+big batches spread over a process pool) and summarizes it in one vectorized pass.
+A persistent memo cache means text we've scored before never pays for NLP again.
+"""
+import hashlib
+import importlib.metadata
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from textblob import TextBlob
+
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+PROCESS_POOL_MIN_BATCH = 500  # below this, pool start-up costs more than it saves
+
+# Bump the suffix when the scoring itself changes so old cached scores are ignored
+ANALYZER_VERSION = f"textblob-{importlib.metadata.version('textblob')}-1"
+CACHE_PATH = "sentiment_cache.db"
+CACHE_MAX_ENTRIES = 500000
+SQL_BATCH = 500  # stay under SQLite's bound-parameter limit
+
+# Label codes; summaries break ties in this order
+POSITIVE, NEUTRAL, NEGATIVE = 0, 1, 2
+LABELS = np.array(['positive', 'neutral', 'negative'])
+
+
+def _polarity(text):
+    return TextBlob(text).sentiment.polarity
+
+
+def _score_chunk(texts):
+    return [_polarity(t) for t in texts]
+
+
+def _score_unique(texts, workers=None):
+    if len(texts) < PROCESS_POOL_MIN_BATCH:
+        return np.fromiter((_polarity(t) for t in texts), dtype=np.float64, count=len(texts))
+
+    workers = workers or os.cpu_count() or 1
+    chunk = -(-len(texts) // workers)
+    chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scored = pool.map(_score_chunk, chunks)
+        return np.fromiter((p for part in scored for p in part), dtype=np.float64, count=len(texts))
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def text_key(text, version=ANALYZER_VERSION):
+    return hashlib.sha256(f"{version}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent polarity memo keyed by hash(analyzer version + normalized text).
+    Bounded to max_entries; least recently used scores are evicted first.
+    Safe to share between threads (enrich_sellers scores off the event loop).
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                key       TEXT PRIMARY KEY,
+                polarity  REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+        self.conn.commit()
+
+    def lookup(self, keys):
+        """{key: polarity} for the keys we already have; bumps their LRU time"""
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), SQL_BATCH):
+                batch = keys[i:i + SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                found.update(self.conn.execute(
+                    f"SELECT key, polarity FROM scores WHERE key IN ({marks})", batch))
+            if found:
+                now = time.time()
+                self.conn.executemany("UPDATE scores SET last_used = ? WHERE key = ?",
+                                      [(now, k) for k in found])
+                self.conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def store(self, scores):
+        """Save {key: polarity} and evict the oldest entries if we're over the bound"""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO scores (key, polarity, last_used) VALUES (?, ?, ?)",
+                                  [(k, float(p), now) for k, p in scores.items()])
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+            if count > self.max_entries:
+                # Trim to 90% so we don't evict on every store
+                excess = count - int(self.max_entries * 0.9)
+                self.conn.execute(
+                    "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)",
+                    (excess,))
+            self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return f"sentiment cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+    def close(self):
+        self.conn.close()
+
+
+def score_texts(texts, workers=None, cache=None):
+    """
+    Polarity in [-1, 1] for every text. Identical texts are only scored once,
+    and with a SentimentCache only texts it has never seen are scored at all.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty(0, dtype=np.float64)
+    unique = list(dict.fromkeys(texts))
+    position = {t: i for i, t in enumerate(unique)}
+
+    if cache is None:
+        scores = _score_unique(unique, workers)
+    else:
+        keys = [text_key(t) for t in unique]
+        known = cache.lookup(keys)
+        todo = [i for i, k in enumerate(keys) if k not in known]
+        fresh = _score_unique([unique[i] for i in todo], workers) if todo else np.empty(0)
+        if todo:
+            cache.store({keys[i]: p for i, p in zip(todo, fresh)})
+        scores = np.fromiter((known.get(k, 0.0) for k in keys), dtype=np.float64, count=len(keys))
+        scores[todo] = fresh
+
+    return scores[np.fromiter((position[t] for t in texts), dtype=np.intp, count=len(texts))]
+
+
+def classify(polarities, positive=POSITIVE_THRESHOLD, negative=NEGATIVE_THRESHOLD):
+    """Label codes (POSITIVE/NEUTRAL/NEGATIVE) for a polarity array"""
+    polarities = np.asarray(polarities, dtype=np.float64)
+    codes = np.full(polarities.shape, NEUTRAL, dtype=np.int8)
+    codes[polarities > positive] = POSITIVE
+    codes[polarities < negative] = NEGATIVE
+    return codes
+
+
+def labels(polarities, positive=POSITIVE_THRESHOLD, negative=NEGATIVE_THRESHOLD):
+    return LABELS[classify(polarities, positive, negative)]
+
+
+def summarize(polarities, positive=POSITIVE_THRESHOLD, negative=NEGATIVE_THRESHOLD):
+    """The sentiment_analysis block enrich_sellers stores for a seller"""
+    codes = classify(polarities, positive, negative)
+    counts = np.bincount(codes, minlength=len(LABELS))
+    return {
+        'total_mentions': int(codes.size),
+        'positive': int(counts[POSITIVE]),
+        'negative': int(counts[NEGATIVE]),
+        'neutral': int(counts[NEUTRAL]),
+        'overall_sentiment': str(LABELS[counts.argmax()]) if codes.size else 'unknown'
+    }
@@ -0,0 +1,175 @@
+"""
+Sharded scraping across worker processes / machines
+URLs are split by consistent hashing of the UserID, each worker scrapes its
+shard into batch_shardN.json (process_data.py already globs batch*.json),
+and the coordinator reports progress per shard from the shard queues.
+
+    python3 shard.py run --shards 8 --urls seller_urls.txt      # all shards on this box
+    python3 shard.py split --shards 8 --urls seller_urls.txt    # per-shard URL files for other machines
+    python3 shard.py status --shards 8                          # progress of every shard queue
+"""
+import argparse
+import bisect
+import hashlib
+import os
+import subprocess
+import sys
+import time
+
+from work_queue import DONE, FAILED, PENDING, SKIPPED, UNCHANGED, WorkQueue, load_url_file, user_id_from_url
+
+VNODES = 128  # virtual nodes per shard, keeps the split even
+
+
+def _hash(key):
+    return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+
+class HashRing:
+    """Consistent-hash ring: changing the shard count only moves ~1/N of the sellers"""
+
+    def __init__(self, num_shards, vnodes=VNODES):
+        if num_shards < 1:
+            raise ValueError("need at least one shard")
+        self.num_shards = num_shards
+        points = sorted((_hash(f"shard-{shard}#{v}"), shard) for shard in range(num_shards) for v in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    def shard_for(self, user_id):
+        i = bisect.bisect(self._hashes, _hash(user_id.lower())) % len(self._hashes)
+        return self._shards[i]
+
+
+def parse_shard_spec(spec):
+    """'2/8' -> (2, 8)"""
+    try:
+        index, total = (int(x) for x in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like INDEX/TOTAL, got '{spec}'")
+    if not 0 <= index < total:
+        raise ValueError(f"Shard index {index} out of range for {total} shards")
+    return index, total
+
+
+def urls_for_shard(urls, index, total):
+    ring = HashRing(total)
+    return [url for url in urls if ring.shard_for(user_id_from_url(url)) == index]
+
+
+def partition(urls, total):
+    ring = HashRing(total)
+    shards = {i: [] for i in range(total)}
+    for url in urls:
+        shards[ring.shard_for(user_id_from_url(url))].append(url)
+    return shards
+
+
+def queue_path(index):
+    return f"scrape_queue.shard{index}.db"
+
+
+def batch_path(index, stamp=None):
+    """batch_shardN.json, or a timestamped delta file for incremental runs"""
+    if stamp:
+        return f"batch_shard{index}_{stamp}.json"
+    return f"batch_shard{index}.json"
+
+
+def shard_status(total):
+    """Per-shard queue counts; shards that haven't started have no queue file yet"""
+    status = {}
+    for index in range(total):
+        path = queue_path(index)
+        if not os.path.exists(path):
+            status[index] = None
+            continue
+        work_queue = WorkQueue(path)
+        try:
+            status[index] = work_queue.counts()
+        finally:
+            work_queue.close()
+    return status
+
+
+def print_status(total):
+    print(f"{'Shard':<7} {'Pending':>8} {'Done':>6} {'Skipped':>8} {'Unchanged':>10} {'Failed':>7} {'Progress':>9}")
+    print("-" * 61)
+    for index, counts in shard_status(total).items():
+        if counts is None:
+            print(f"{index:<7} {'(not started)':>30}")
+            continue
+        queued = sum(counts.values())
+        finished = queued - counts[PENDING]
+        pct = 100.0 * finished / queued if queued else 100.0
+        print(f"{index:<7} {counts[PENDING]:>8} {counts[DONE]:>6} {counts[SKIPPED]:>8} {counts[UNCHANGED]:>10} {counts[FAILED]:>7} {pct:>8.0f}%")
+
+
+def run_local(total, urls_file, worker_args, poll_seconds=10, fresh=False):
+    """
+    Start one scrape_whatnot.py worker per shard and report progress until they finish.
+    A shard whose queue already exists is resumed, unless `fresh`.
+    """
+    procs = []
+    for index in range(total):
+        cmd = [sys.executable, "scrape_whatnot.py", "--shard", f"{index}/{total}", "--urls", urls_file,
+               "--target", "0"] + worker_args
+        if not fresh and os.path.exists(queue_path(index)) and "--resume" not in worker_args:
+            # Pick up where a crashed/stopped run left off instead of resetting the shard queue
+            cmd.append("--resume")
+        log = open(f"shard{index}.log", "w")
+        procs.append((subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT), log))
+        print(f"Started shard {index}/{total} (log: shard{index}.log)")
+
+    try:
+        while any(proc.poll() is None for proc, _ in procs):
+            time.sleep(poll_seconds)
+            print()
+            print_status(total)
+    finally:
+        for proc, log in procs:
+            if proc.poll() is None:
+                proc.terminate()
+            log.close()
+
+    print()
+    print_status(total)
+    failed = [i for i, (proc, _) in enumerate(procs) if proc.returncode != 0]
+    if failed:
+        print(f"Shards exited with errors: {failed}")
+    print("Merge with: python3 process_data.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded seller scraping")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run every shard as a local worker process")
+    run_p.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    run_p.add_argument("--urls", default="seller_urls.txt")
+    run_p.add_argument("--fresh", action="store_true", help="Reset existing shard queues instead of resuming them")
+
+    split_p = sub.add_parser("split", help="Write one URL file per shard")
+    split_p.add_argument("--shards", type=int, required=True)
+    split_p.add_argument("--urls", default="seller_urls.txt")
+
+    status_p = sub.add_parser("status", help="Show progress per shard")
+    status_p.add_argument("--shards", type=int, required=True)
+
+    args, worker_args = parser.parse_known_args()
+
+    if args.command == "run":
+        run_local(args.shards, args.urls, worker_args, fresh=args.fresh)
+    elif args.command == "split":
+        for index, urls in partition(load_url_file(args.urls), args.shards).items():
+            path = f"seller_urls.shard{index}.txt"
+            with open(path, "w") as f:
+                for url in urls:
+                    f.write(url + "\n")
+            print(f"Shard {index}: {len(urls)} URLs -> {path}")
+    else:
+        print_status(args.shards)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+seller_bot_llm against a stub OpenAI-compatible server: each turn gets only
+the sellers its question needs, and the request stays small however big the
+dataset is.
+
+    python -m pytest -q test_seller_bot_llm.py
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # the module builds its client at import
+import seller_bot_llm  # noqa: E402
+from seller_bot import thresholds
+from seller_catalog import SellerCatalog
+from seller_retrieval import MAX_RECORDS
+
+SELLERS = 20000
+MAX_REQUEST_CHARS = 20000  # system prompt + context + history, for any dataset size
+
+
+class StubChat(BaseHTTPRequestHandler):
+    """Records each chat.completions request and answers with a fixed reply"""
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body)
+        reply = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"stub reply {len(self.requests)}"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubChat)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def llm(stub_server, monkeypatch):
+    monkeypatch.setattr(seller_bot_llm, "client", OpenAI(api_key="test", base_url=stub_server))
+    StubChat.requests.clear()
+    return StubChat.requests
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    sellers = [{'UserID': f'seller{i}', 'UserName': f'Seller Name {i}', 'Seller Rating': 4.9,
+                'Sold': f'{i % 900 + 100}', 'Reviews': f'{i % 700}', 'Followers': '10', 'Average Ship': '1d'}
+               for i in range(SELLERS)]
+    sellers.append({'UserID': 'krakenhits', 'UserName': 'Kraken Hits', 'Seller Rating': 4.7,
+                    'Sold': '20K', 'Reviews': '9K', 'Followers': '1K', 'Average Ship': '2d'})
+    return SellerCatalog(sellers, thresholds())
+
+
+def records(context):
+    return [json.loads(line) for line in context.splitlines() if line.startswith("{")]
+
+
+def request_chars(request):
+    return sum(len(m["content"]) for m in request["messages"])
+
+
+@pytest.mark.parametrize("question, user_id", [
+    ("Is Seller Name 7 approved?", "seller7"),
+    ("tell me about kraken hits", "krakenhits"),
+    ("what do people say about Krakn Hits?", "krakenhits"),
+])
+def test_named_seller_is_in_context(llm, catalog, question, user_id):
+    history = []
+    response, context = seller_bot_llm.ask(question, catalog, {}, history)
+
+    assert response == "stub reply 1"
+    sent = llm[0]["messages"]
+    assert sent[-1] == {"role": "user", "content": question}
+    assert sent[-2] == {"role": "system", "content": context}
+    assert records(context)[0]["UserID"] == user_id
+    assert len(records(context)) <= MAX_RECORDS
+    assert request_chars(llm[0]) < MAX_REQUEST_CHARS
+    assert len(history) == 2
+
+
+def test_context_stays_bounded_over_a_conversation(llm, catalog):
+    history, context = [], None
+    questions = ["top 10 by sold", "recommend some sellers", "why?", "Seller Name 12345 stats"]
+    for turn in range(2 * seller_bot_llm.MAX_TURNS):
+        _, context = seller_bot_llm.ask(questions[turn % len(questions)], catalog, {}, history, context)
+
+    for request in llm:
+        assert len(request["messages"]) <= 2 * seller_bot_llm.MAX_TURNS + 3
+        assert request_chars(request) < MAX_REQUEST_CHARS
+    assert records(llm[-1]["messages"][-2]["content"])[0]["UserID"] == "seller12345"
@@ -0,0 +1,47 @@
+"""
+ThreadStore.fan_out: a thread is handed to the sellers it names, and only those.
+
+    python -m pytest -q test_thread_store.py
+"""
+import asyncio
+
+from thread_store import ThreadStore
+
+URL = "https://www.reddit.com/r/whatnot/comments/abc/box_review/"
+
+
+class StubClient:
+    """Serves one thread for any URL"""
+
+    def __init__(self, title, comments):
+        self.listing = [
+            {"data": {"children": [{"data": {"title": title, "selftext": "", "name": "t3_abc"}}]}},
+            {"data": {"children": [{"kind": "t1", "data": {"body": c, "created_utc": 0}} for c in comments]}},
+        ]
+
+    async def get_json(self, url):
+        return self.listing
+
+
+def fan_out(sellers, title, comments):
+    store = ThreadStore(StubClient(title, comments))
+    asyncio.run(store.get(URL))
+    return {user_id: len(threads) for user_id, threads in store.fan_out(sellers).items()}
+
+
+def test_phrases_match_whole_words_only():
+    sellers = [
+        {"UserID": "bobb_breaks", "UserName": "Bob B"},
+        {"UserID": "cardco", "UserName": "Card Co"},
+    ]
+    assert fan_out(sellers, "Box review", ["bob bought a card co-op box; the card collection was great"]) == {}
+
+
+def test_phrases_and_handles_are_found():
+    sellers = [
+        {"UserID": "cardco", "UserName": "Card Co"},
+        {"UserID": "kraken_hits", "UserName": "Kraken Hits"},
+        {"UserID": "bobb_breaks", "UserName": "Bob B"},
+    ]
+    comments = ["Card Co, shipped fast!", "kraken_hits again"]
+    assert fan_out(sellers, "Who's good?", comments) == {"cardco": 1, "kraken_hits": 1}
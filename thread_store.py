@@ -0,0 +1,170 @@
+"""
+Per-run Reddit thread store
+Every permalink is fetched once per run however many sellers' searches find it.
+The comment tree, 'more' stubs included, is walked in a single iterative pass,
+and finished threads are fanned out to every seller whose name appears in them.
+"""
+import asyncio
+import re
+import time
+
+from reddit_client import RequestUnavailable
+
+MAX_COMMENTS_PER_THREAD = 100
+MAX_MORE_REQUESTS = 2  # morechildren calls per thread
+MORE_BATCH = 100       # Reddit accepts at most 100 ids per morechildren call
+MENTION_CHARS = 200    # stored mention text is truncated for brevity (after sentiment scoring)
+MIN_NAME_LEN = 4       # shorter names match too many unrelated words
+
+SKIP_BODIES = {'[deleted]', '[removed]'}
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+WORD_RE = re.compile(r"[a-z0-9_]+(?:['\-][a-z0-9_]+)*")  # "co-op" and "bob's" stay one word
+
+
+def word_key(text):
+    """Lower-cased text as space-separated whole words, padded so a phrase only matches whole words"""
+    return f" {' '.join(WORD_RE.findall(text.lower()))} "
+
+
+def permalink_key(url):
+    return url.split('?')[0].rstrip('/').lower()
+
+
+def walk_comments(children, comments, more_ids, limit=MAX_COMMENTS_PER_THREAD):
+    """
+    Pre-order walk over a listing's children with an explicit stack.
+    Comment bodies go to `comments`, ids behind 'more' stubs go to `more_ids`.
+    """
+    stack = list(reversed(children))
+    while stack:
+        node = stack.pop()
+        kind = node.get('kind')
+        data = node.get('data', {})
+        if kind == 'more':
+            more_ids.extend(data.get('children', []))
+            continue
+        if kind != 't1':
+            continue
+        body = data.get('body')
+        if body and body not in SKIP_BODIES and len(comments) < limit:
+            comments.append({'text': body, 'created': data.get('created_utc')})
+        replies = data.get('replies')
+        if isinstance(replies, dict):
+            stack.extend(reversed(replies.get('data', {}).get('children', [])))
+
+
+def seller_names(seller):
+    names = {str(seller.get('UserID', '')).lower(), str(seller.get('UserName', '')).lower()}
+    return {n for n in names if len(n) >= MIN_NAME_LEN}
+
+
+def thread_mentions(thread):
+    """
+    A thread's comments in the reddit_mentions format enrich_sellers stores.
+    The text is the full comment body; it's truncated to MENTION_CHARS once it has been scored.
+    """
+    mentions = []
+    for c in thread['comments']:
+        date = time.strftime('%Y-%m-%d', time.gmtime(c['created'])) if c.get('created') else 'N/A'
+        mentions.append({
+            'text': c['text'],
+            'sentiment': 'unknown',  # Will classify later
+            'date': date,
+            'thread': thread['url'],
+        })
+    return mentions
+
+
+class ThreadStore:
+    def __init__(self, client, max_comments=MAX_COMMENTS_PER_THREAD, max_more_requests=MAX_MORE_REQUESTS):
+        self.client = client
+        self.max_comments = max_comments
+        self.max_more_requests = max_more_requests
+        self.threads = {}   # permalink key -> parsed thread
+        self.found_by = {}  # permalink key -> UserIDs whose own search returned it
+        self.reused = 0
+        self._tasks = {}
+
+    async def get(self, url, user_id=None):
+        """
+        The parsed thread (or None if it couldn't be fetched); concurrent callers share one fetch.
+        RequestUnavailable from the client propagates.
+        """
+        key = permalink_key(url)
+        if user_id:
+            self.found_by.setdefault(key, set()).add(user_id)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url, key))
+            self._tasks[key] = task
+        else:
+            self.reused += 1
+        return await task
+
+    async def _fetch(self, url, key):
+        json_url = url.split('?')[0].rstrip('/') + '.json?limit=500&raw_json=1'
+        try:
+            data = await self.client.get_json(json_url)
+            # Reddit JSON structure (List of listings: [0] is post, [1] is comments)
+            if not (isinstance(data, list) and len(data) > 1):
+                return None
+            posts = data[0].get('data', {}).get('children', [])
+            post = posts[0].get('data', {}) if posts else {}
+
+            comments, more_ids = [], []
+            walk_comments(data[1].get('data', {}).get('children', []), comments, more_ids, self.max_comments)
+
+            link_id = post.get('name')
+            calls = 0
+            while more_ids and link_id and len(comments) < self.max_comments and calls < self.max_more_requests:
+                batch, more_ids = more_ids[:MORE_BATCH], more_ids[MORE_BATCH:]
+                more = await self.client.get_json(
+                    "https://www.reddit.com/api/morechildren.json?api_type=json&raw_json=1"
+                    f"&link_id={link_id}&children={','.join(batch)}")
+                calls += 1
+                things = (more or {}).get('json', {}).get('data', {}).get('things', [])
+                walk_comments(things, comments, more_ids, self.max_comments)
+        except RequestUnavailable:
+            # Not fetched, as opposed to missing: let a later lookup try again
+            self._tasks.pop(key, None)
+            raise
+        except Exception as e:
+            print(f"  Warning: Failed to fetch thread {url} ({str(e)})")
+            return None
+
+        text = " ".join([post.get('title', ''), post.get('selftext', '')] + [c['text'] for c in comments]).lower()
+        thread = {
+            'url': url,
+            'title': post.get('title', ''),
+            'comments': comments,
+            'text': text,
+            'tokens': set(TOKEN_RE.findall(text)),
+            'words': word_key(text),
+        }
+        self.threads[key] = thread
+        return thread
+
+    def fan_out(self, sellers):
+        """
+        {UserID: [threads]} for threads that name a seller but that seller's own
+        search didn't return. Single-word names are looked up in each thread's
+        token set; multi-word display names must appear as the same run of
+        whole words ("Card Co" doesn't match "card co-op").
+        """
+        by_token, phrases = {}, []
+        for s in sellers:
+            for name in seller_names(s):
+                if TOKEN_RE.fullmatch(name):
+                    by_token.setdefault(name, set()).add(s['UserID'])
+                elif word_key(name).strip():
+                    phrases.append((word_key(name), s['UserID']))
+
+        extra = {}
+        for key, thread in self.threads.items():
+            named = set()
+            for token in thread['tokens'] & by_token.keys():
+                named |= by_token[token]
+            named.update(uid for phrase, uid in phrases if phrase in thread['words'])
+            for user_id in named - self.found_by.get(key, set()):
+                extra.setdefault(user_id, []).append(thread)
+        return extra
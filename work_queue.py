@@ -0,0 +1,105 @@
+"""
+On-disk work queue for the scraper
+Discovered profile URLs live in SQLite with a state, and each profile's record
+is committed as soon as it's scraped, so a crashed run can be resumed
+"""
+import json
+import sqlite3
+import time
+
+QUEUE_PATH = "scrape_queue.db"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"  # scraped fine, but below the rating cut
+UNCHANGED = "unchanged"  # incremental run: same content as the last scrape
+STATES = (PENDING, DONE, FAILED, SKIPPED, UNCHANGED)
+
+
+def user_id_from_url(url):
+    return url.rstrip('/').split('/')[-1]
+
+
+class WorkQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url        TEXT PRIMARY KEY,
+                user_id    TEXT NOT NULL,
+                state      TEXT NOT NULL DEFAULT 'pending',
+                attempts   INTEGER NOT NULL DEFAULT 0,
+                error      TEXT,
+                record     TEXT,
+                updated_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state)")
+        self.conn.commit()
+
+    def enqueue(self, urls):
+        """Add URLs as pending; ones already queued keep their state. Returns how many were new."""
+        now = time.time()
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO urls (url, user_id, updated_at) VALUES (?, ?, ?)",
+            [(url, user_id_from_url(url), now) for url in urls],
+        )
+        self.conn.commit()
+        return self.conn.total_changes - before
+
+    def reset(self):
+        """Forget everything (a fresh, non-resumed run)"""
+        self.conn.execute("DELETE FROM urls")
+        self.conn.commit()
+
+    def retry_failed(self):
+        cur = self.conn.execute("UPDATE urls SET state = ? WHERE state = ?", (PENDING, FAILED))
+        self.conn.commit()
+        return cur.rowcount
+
+    def pending(self):
+        rows = self.conn.execute("SELECT url FROM urls WHERE state = ? ORDER BY rowid", (PENDING,))
+        return [url for (url,) in rows]
+
+    def _finish(self, url, state, record=None, error=None):
+        self.conn.execute(
+            "UPDATE urls SET state = ?, record = ?, error = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE url = ?",
+            (state, json.dumps(record) if record is not None else None, error, time.time(), url),
+        )
+        self.conn.commit()
+
+    def mark_done(self, url, record):
+        self._finish(url, DONE, record=record)
+
+    def mark_skipped(self, url, record):
+        self._finish(url, SKIPPED, record=record)
+
+    def mark_unchanged(self, url):
+        self._finish(url, UNCHANGED)
+
+    def mark_failed(self, url, error):
+        self._finish(url, FAILED, error=error)
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        for state, n in self.conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state"):
+            counts[state] = n
+        return counts
+
+    def records(self):
+        """Records of every kept profile, in the order they finished"""
+        rows = self.conn.execute("SELECT record FROM urls WHERE state = ? ORDER BY updated_at", (DONE,))
+        return [json.loads(record) for (record,) in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+def load_url_file(path):
+    """Read a seller_urls.txt style file (one URL per line)"""
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]